@@ -1,24 +1,53 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
+#: Background listener that owns the real handlers, once logging is set up.
+_listener: Optional[QueueListener] = None
 
-def setup_logging(log_path: Union[str, Path], level: int = logging.INFO) -> None:
+
+def setup_logging(
+    log_path: Union[str, Path], level: int = logging.INFO
+) -> QueueListener:
     """
     Configure logging for the application.
 
+    Log records are put on an in‐memory queue by a `QueueHandler` on the root
+    logger; a `QueueListener` thread writes them to the log file and stderr,
+    so callers never block on handler I/O. The listener is stopped (and the
+    queue drained) at interpreter exit. Calling this again returns the
+    existing listener unchanged.
+
     Args:
         log_path (str or Path): The file system path where the log file should be created.
         level (int, optional): The logging level threshold. Defaults to logging.INFO.
 
     Returns:
-        None
+        QueueListener: The running listener, e.g. to `stop()` it on shutdown.
     """
+    global _listener
+    if _listener is not None:
+        return _listener
+
     log_path = Path(log_path)
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        filename=str(log_path),
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    file_handler = logging.FileHandler(str(log_path))
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    stream_handler = logging.StreamHandler()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
-    logging.getLogger().addHandler(logging.StreamHandler())
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
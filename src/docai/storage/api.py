@@ -8,9 +8,11 @@ page images associated with documents. It uses an asynchronous file storage serv
 import uvicorn
 import logging
 from datetime import datetime, timezone
+from typing import List
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from fastapi import Depends, FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel
 
 from docai.storage.config import BASE_PATH, HOST, PORT, LOG_FILE
 from docai.shared.models.dto.meta import Meta
@@ -19,12 +21,16 @@ from docai.storage.schemas import (
     SavePDFData,
     SaveImageResponse,
     SaveImageData,
+    SaveImagesResponse,
+    SaveImagesData,
     DeleteDocumentResponse,
     DeleteDocumentData,
     ErrorResponse,
 )
 from docai.storage.storage import StorageService
 from docai.storage.exceptions import (
+    FileTooLargeError,
+    InvalidDocumentIdError,
     SavePDFError,
     SaveImageError,
     PDFNotFoundError,
@@ -48,32 +54,65 @@ app = FastAPI(
 s_service = StorageService(BASE_PATH)
 
 
+def get_storage_service() -> StorageService:
+    """
+    FastAPI dependency returning the process‐wide `StorageService`.
+
+    Tests swap in their own instance through `app.dependency_overrides`
+    instead of patching the module global.
+    """
+    return s_service
+
+
 def _response_meta() -> Meta:
     """Generate a fresh Meta object."""
     return Meta(timestamp=datetime.now(timezone.utc), version="1.0.0")
 
 
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON with pydantic-core.
+
+    Returning a `Response` skips FastAPI's re-validation and `jsonable_encoder`
+    pass over `response_model`, which then only documents the schema.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 @app.post(
     "/pdf/save",
     response_model=SavePDFResponse,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
 )
-async def save_pdf(doc_id: str, file: UploadFile = File(...)) -> SavePDFResponse:
+async def save_pdf(
+    doc_id: str,
+    file: UploadFile = File(...),
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
     """
-    Save a PDF file asynchronously.
+    Save a PDF file, copying the spooled upload to disk in one worker thread.
 
     Args:
         doc_id (str): Unique document identifier.
         file (UploadFile): Uploaded PDF file.
+        storage (StorageService): Injected storage backend.
 
     Returns:
-        SavePDFResponse: Response containing saved‐PDF details and meta.
+        Response: JSON `SavePDFResponse` with saved‐PDF details and meta.
     """
-    content = await file.read()
     try:
-        path = await s_service.save_pdf(doc_id, content)
+        path = await storage.save_pdf(doc_id, file.file)
         data = SavePDFData(doc_id=doc_id, pdf_path=str(path))
-        return SavePDFResponse(data=data, meta=_response_meta())
+        return _json_response(SavePDFResponse(data=data, meta=_response_meta()))
+    except InvalidDocumentIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        logger.warning("PDF upload too large for %s: %s", doc_id, e)
+        raise HTTPException(status_code=413, detail=str(e))
     except SavePDFError as e:
         logger.error("Error saving PDF for %s: %s", doc_id, e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -87,20 +126,26 @@ async def save_pdf(doc_id: str, file: UploadFile = File(...)) -> SavePDFResponse
         500: {"model": ErrorResponse},
     },
 )
-async def get_pdf(doc_id: str) -> FileResponse:
+async def get_pdf(
+    doc_id: str,
+    storage: StorageService = Depends(get_storage_service),
+) -> FileResponse:
     """
     Retrieve a stored PDF file asynchronously.
 
     Args:
         doc_id (str): Unique document identifier.
+        storage (StorageService): Injected storage backend.
 
     Returns:
         FileResponse: The PDF file stream.
     """
     try:
-        path = await s_service.get_pdf_path(doc_id)
+        path = await storage.get_pdf_path(doc_id)
         return FileResponse(
-            path=str(path), media_type="application/pdf", filename=f"{doc_id}.pdf"
+            path=str(path),
+            media_type="application/pdf",
+            filename=f"{doc_id}.pdf",
         )
     except PDFNotFoundError as e:
         logger.warning("PDF not found for %s: %s", doc_id, e)
@@ -115,31 +160,43 @@ async def get_pdf(doc_id: str) -> FileResponse:
 @app.post(
     "/image/save",
     response_model=SaveImageResponse,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
 )
 async def save_image(
     doc_id: str,
     page_number: int = Query(..., ge=0),
     file: UploadFile = File(...),
-) -> SaveImageResponse:
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
     """
-    Save a page image asynchronously.
+    Save a page image, copying the spooled upload to disk in one worker thread.
 
     Args:
         doc_id (str): Unique document identifier.
         page_number (int): Zero‐based page index.
         file (UploadFile): Uploaded JPEG file.
+        storage (StorageService): Injected storage backend.
 
     Returns:
-        SaveImageResponse: Response containing saved‐image details and meta.
+        Response: JSON `SaveImageResponse` with saved‐image details and meta.
     """
-    content = await file.read()
     try:
-        path = await s_service.save_image(doc_id, page_number, content)
+        path = await storage.save_image(doc_id, page_number, file.file)
         data = SaveImageData(
             doc_id=doc_id, page_number=page_number, image_path=str(path)
         )
-        return SaveImageResponse(data=data, meta=_response_meta())
+        return _json_response(SaveImageResponse(data=data, meta=_response_meta()))
+    except InvalidDocumentIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        logger.warning(
+            "Image upload too large for %s page %d: %s", doc_id, page_number, e
+        )
+        raise HTTPException(status_code=413, detail=str(e))
     except SaveImageError as e:
         logger.error(
             "Error saving image for %s page %d: %s",
@@ -151,6 +208,65 @@ async def save_image(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post(
+    "/image/save_batch",
+    response_model=SaveImagesResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def save_images(
+    doc_id: str,
+    page_numbers: List[int] = Query(...),
+    files: List[UploadFile] = File(...),
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
+    """
+    Save several page images of one document in a single request.
+
+    Each spooled upload is copied to disk in chunks; none is read into memory.
+    The batch is all‐or‐nothing: on an error response no page of it is stored.
+
+    Args:
+        doc_id (str): Unique document identifier.
+        page_numbers (List[int]): Zero‐based page indices, one per file.
+        files (List[UploadFile]): Uploaded JPEG files, in the same order.
+        storage (StorageService): Injected storage backend.
+
+    Returns:
+        Response: JSON `SaveImagesResponse` with saved‐images details and meta.
+    """
+    if len(page_numbers) != len(files):
+        raise HTTPException(
+            status_code=422, detail="page_numbers and files must have the same length."
+        )
+    if any(p < 0 for p in page_numbers):
+        raise HTTPException(status_code=422, detail="page_numbers must be >= 0.")
+
+    pages = [(p, f.file) for p, f in zip(page_numbers, files)]
+    try:
+        paths = await storage.save_images(doc_id, pages)
+        data = SaveImagesData(
+            doc_id=doc_id,
+            images=[
+                SaveImageData(doc_id=doc_id, page_number=p, image_path=str(path))
+                for p, path in zip(page_numbers, paths)
+            ],
+        )
+        return _json_response(SaveImagesResponse(data=data, meta=_response_meta()))
+    except InvalidDocumentIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        logger.warning("Image upload too large for %s: %s", doc_id, e)
+        raise HTTPException(status_code=413, detail=str(e))
+    except SaveImageError as e:
+        logger.error("Error saving images for %s: %s", doc_id, e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get(
     "/image/get",
     responses={
@@ -159,19 +275,24 @@ async def save_image(
         500: {"model": ErrorResponse},
     },
 )
-async def get_image(doc_id: str, page_number: int = Query(..., ge=0)) -> FileResponse:
+async def get_image(
+    doc_id: str,
+    page_number: int = Query(..., ge=0),
+    storage: StorageService = Depends(get_storage_service),
+) -> FileResponse:
     """
     Retrieve a stored page image asynchronously.
 
     Args:
         doc_id (str): Unique document identifier.
         page_number (int): Zero‐based page index.
+        storage (StorageService): Injected storage backend.
 
     Returns:
         FileResponse: The JPEG image stream.
     """
     try:
-        path = await s_service.get_image_path(doc_id, page_number)
+        path = await storage.get_image_path(doc_id, page_number)
         return FileResponse(
             path=str(path),
             media_type="image/jpeg",
@@ -194,24 +315,30 @@ async def get_image(doc_id: str, page_number: int = Query(..., ge=0)) -> FileRes
 @app.delete(
     "/document/delete",
     response_model=DeleteDocumentResponse,
-    responses={500: {"model": ErrorResponse}},
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
-async def delete_document(doc_id: str) -> DeleteDocumentResponse:
+async def delete_document(
+    doc_id: str,
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
     """
     Delete a document and all its associated files asynchronously.
 
     Args:
         doc_id (str): Document identifier.
+        storage (StorageService): Injected storage backend.
 
     Returns:
-        DeleteDocumentResponse: Response containing deletion confirmation and meta.
+        Response: JSON `DeleteDocumentResponse` with deletion confirmation and meta.
     """
     try:
-        await s_service.delete_document(doc_id)
+        await storage.delete_document(doc_id)
         data = DeleteDocumentData(
             doc_id=doc_id, detail="Document deleted successfully."
         )
-        return DeleteDocumentResponse(data=data, meta=_response_meta())
+        return _json_response(DeleteDocumentResponse(data=data, meta=_response_meta()))
+    except InvalidDocumentIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except DeleteDocumentError as e:
         logger.error("Error deleting document %s: %s", doc_id, e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
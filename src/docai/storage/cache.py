@@ -0,0 +1,92 @@
+"""
+Small in‐process caches used by the Storage Service.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU mapping whose entries expire `ttl` seconds after being set.
+
+    Not thread‐safe; it is meant to be used from a single event loop.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept before evicting the
+            least recently used one.
+        ttl (float): Lifetime of an entry in seconds. A value <= 0 disables
+            the cache: `set` is a no‐op and `get` always misses.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Entry lifetime in seconds.
+            timer (Callable[[], float]): Clock used for expiry (monotonic seconds).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Return the cached value for `key`, or None if missing or expired.
+
+        Args:
+            key (K): Cache key.
+
+        Returns:
+            Optional[V]: The cached value, if still fresh.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entry if full.
+
+        Args:
+            key (K): Cache key.
+            value (V): Value to cache.
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (self._timer() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """
+        Drop `key` from the cache if present.
+
+        Args:
+            key (K): Cache key.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
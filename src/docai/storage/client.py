@@ -1,11 +1,13 @@
+import contextlib
 import logging
 from pathlib import Path
-from typing import Union, IO, Optional
+from typing import Iterator, List, Sequence, Tuple, Union, IO, Optional
 
 import httpx
 from httpx import AsyncHTTPTransport
 
 from docai.storage.config import (
+    CLIENT_HTTP2,
     CLIENT_MAX_CONNECTIONS,
     CLIENT_MAX_KEEPALIVE_CONNECTIONS,
     CLIENT_REQUEST_TIMEOUT_SECONDS,
@@ -14,6 +16,28 @@ from docai.storage.config import (
 logger = logging.getLogger(__name__)
 
 
+@contextlib.contextmanager
+def _open_upload(file: Union[Path, IO[bytes]]) -> Iterator[Tuple[str, IO[bytes]]]:
+    """
+    Open an upload source for httpx to stream as a multipart field.
+
+    A `Path` is opened here and closed on exit; a file-like object is passed
+    through and left open. httpx then reads the file in chunks while sending
+    instead of the client loading it into memory first.
+
+    Args:
+        file (Path | IO[bytes]): Either a `Path` on disk or a binary file-like object.
+
+    Yields:
+        Tuple[str, IO[bytes]]: The filename to send and the binary file object.
+    """
+    if isinstance(file, Path):
+        with file.open("rb") as f:
+            yield file.name, f
+    else:
+        yield getattr(file, "name", "file"), file
+
+
 class StorageClient:
     """
     Async client for interacting with the Storage Service API using httpx.
@@ -33,6 +57,8 @@ class StorageClient:
         timeout: Optional[float] = None,
         max_connections: Optional[int] = None,
         max_keepalive_connections: Optional[int] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ) -> None:
         """
         Args:
@@ -40,6 +66,11 @@ class StorageClient:
             timeout (float | None): Seconds to wait for each request.
             max_connections (int | None): Max concurrent TCP connections.
             max_keepalive_connections (int | None): Max idle keep-alive connections.
+            http2 (bool | None): Negotiate HTTP/2 (requires the `h2` package).
+            transport (httpx.AsyncBaseTransport | None): Transport to send
+                requests through instead of a pooled `AsyncHTTPTransport`,
+                e.g. an `httpx.MockTransport` in tests. Connection limits and
+                `http2` do not apply to a custom transport.
         """
         self.base_url = base_url.rstrip("/")
         t = timeout or CLIENT_REQUEST_TIMEOUT_SECONDS
@@ -48,19 +79,23 @@ class StorageClient:
             max_keepalive_connections=max_keepalive_connections
             or CLIENT_MAX_KEEPALIVE_CONNECTIONS,
         )
+        use_http2 = CLIENT_HTTP2 if http2 is None else http2
         logger.debug(
-            "Initializing AsyncClient(base_url=%r, timeout=%.1fs, limits=%r)",
+            "Initializing AsyncClient(base_url=%r, timeout=%.1fs, limits=%r, http2=%s)",
             self.base_url,
             t,
             limits,
+            use_http2,
         )
 
-        transport = AsyncHTTPTransport(retries=3)
+        # The connection pool lives in the transport: limits passed to
+        # AsyncClient are ignored once an explicit transport is given.
+        if transport is None:
+            transport = AsyncHTTPTransport(retries=3, limits=limits, http2=use_http2)
 
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(t),
-            limits=limits,
             transport=transport,
         )
 
@@ -89,23 +124,12 @@ class StorageClient:
         Raises:
             httpx.HTTPStatusError: If the HTTP request fails (status_code >= 400).
         """
-        if isinstance(pdf_file, Path):
-            content = pdf_file.read_bytes()
-            filename = pdf_file.name
-        else:
-            content = pdf_file.read()
-            filename = getattr(pdf_file, "name", "file")
-
-        files = {"file": (filename, content, "application/pdf")}
-        logger.debug(
-            "save_pdf start: doc_id=%s filename=%s size=%dB",
-            doc_id,
-            filename,
-            len(content),
-        )
-        resp = await self._client.post(
-            "/pdf/save", params={"doc_id": doc_id}, files=files
-        )
+        with _open_upload(pdf_file) as (filename, content):
+            files = {"file": (filename, content, "application/pdf")}
+            logger.debug("save_pdf start: doc_id=%s filename=%s", doc_id, filename)
+            resp = await self._client.post(
+                "/pdf/save", params={"doc_id": doc_id}, files=files
+            )
         resp.raise_for_status()
         saved = resp.json()["data"]["pdf_path"]
         logger.info("save_pdf success: doc_id=%s → %s", doc_id, saved)
@@ -129,26 +153,19 @@ class StorageClient:
         Raises:
             httpx.HTTPStatusError: If the HTTP request fails (status_code >= 400).
         """
-        if isinstance(image_file, Path):
-            content = image_file.read_bytes()
-            filename = image_file.name
-        else:
-            content = image_file.read()
-            filename = getattr(image_file, "name", "file")
-
-        files = {"file": (filename, content, "image/jpeg")}
-        logger.debug(
-            "save_image start: doc_id=%s page=%d filename=%s size=%dB",
-            doc_id,
-            page_number,
-            filename,
-            len(content),
-        )
-        resp = await self._client.post(
-            "/image/save",
-            params={"doc_id": doc_id, "page_number": page_number},
-            files=files,
-        )
+        with _open_upload(image_file) as (filename, content):
+            files = {"file": (filename, content, "image/jpeg")}
+            logger.debug(
+                "save_image start: doc_id=%s page=%d filename=%s",
+                doc_id,
+                page_number,
+                filename,
+            )
+            resp = await self._client.post(
+                "/image/save",
+                params={"doc_id": doc_id, "page_number": page_number},
+                files=files,
+            )
         resp.raise_for_status()
         saved = resp.json()["data"]["image_path"]
         logger.info(
@@ -159,6 +176,43 @@ class StorageClient:
         )
         return saved
 
+    async def save_images(
+        self,
+        doc_id: str,
+        images: Sequence[Tuple[int, Union[Path, IO[bytes]]]],
+    ) -> List[str]:
+        """
+        Upload several page-images of a document in a single request.
+
+        Args:
+            doc_id (str): Unique identifier for the document.
+            images (Sequence[Tuple[int, Path | IO[bytes]]]): (page_number, file)
+                pairs, where each file is a `Path` or binary file-like object.
+
+        Returns:
+            List[str]: The paths (on the storage server) where the images were
+                saved, in the order given.
+
+        Raises:
+            httpx.HTTPStatusError: If the HTTP request fails (status_code >= 400).
+        """
+        page_numbers = [page_number for page_number, _ in images]
+        logger.debug("save_images start: doc_id=%s pages=%d", doc_id, len(page_numbers))
+        with contextlib.ExitStack() as stack:
+            files = []
+            for _, image_file in images:
+                filename, content = stack.enter_context(_open_upload(image_file))
+                files.append(("files", (filename, content, "image/jpeg")))
+            resp = await self._client.post(
+                "/image/save_batch",
+                params={"doc_id": doc_id, "page_numbers": page_numbers},
+                files=files,
+            )
+        resp.raise_for_status()
+        saved = [img["image_path"] for img in resp.json()["data"]["images"]]
+        logger.info("save_images success: doc_id=%s pages=%d", doc_id, len(saved))
+        return saved
+
     async def get_pdf(self, doc_id: str) -> bytes:
         """
         Download the raw PDF bytes for a document asynchronously.
@@ -1,4 +1,7 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Final
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,7 +22,34 @@ class StorageSettings(BaseSettings):
         default=Path("logs/storage_service.log"),
         description="Path to the service log file",
     )
-    lock_stripes: int = Field(default=1024, description="How many lock stripes to use.")
+    use_o_direct: bool = Field(
+        default=False,
+        description="Write uploads with O_DIRECT, bypassing the page cache",
+    )
+    max_upload_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Largest accepted upload in bytes (0 disables the limit)",
+    )
+    shard_prefix_len: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Group files into sub-directories named after the first N "
+            "characters of the doc_id (0 keeps a flat layout)"
+        ),
+    )
+    exists_cache_ttl: float = Field(
+        default=0.0,
+        description=(
+            "Seconds a positive file-existence check is cached (0 disables). "
+            "The cache is per process: a file deleted by another process or "
+            "uvicorn worker is still reported as present for this long, and "
+            "serving it then fails, so only enable it with a single worker."
+        ),
+    )
+    exists_cache_size: int = Field(
+        default=100_000, description="Max number of cached existence checks"
+    )
     client_max_connections: int = Field(
         default=10, description="Max concurrent HTTP connections"
     )
@@ -29,6 +59,9 @@ class StorageSettings(BaseSettings):
     client_request_timeout_seconds: float = Field(
         default=10.0, description="Per-request timeout in seconds"
     )
+    client_http2: bool = Field(
+        default=False, description="Negotiate HTTP/2 (requires the h2 package)"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="STORAGE_",
@@ -38,15 +71,37 @@ class StorageSettings(BaseSettings):
     )
 
 
-_settings = StorageSettings()
+def load_settings() -> StorageSettings:
+    """Parse a fresh `StorageSettings` from the current environment and .env."""
+    return StorageSettings()
+
+
+@lru_cache(maxsize=1)
+def settings() -> StorageSettings:
+    """
+    Return the process‐wide settings, parsed from the environment on first use.
+
+    ``settings.cache_clear()`` only makes later ``settings()`` calls re‐read
+    the environment. The ``Final`` constants below, and every service built
+    from them, keep the values read at import.
+    """
+    return load_settings()
+
+
+_settings = settings()
 
-VERSION: str = _settings.version
-BASE_PATH: Path = _settings.base_path
-HOST: str = _settings.host
-PORT: int = _settings.port
-LOG_FILE: Path = _settings.log_file
-LOCK_STRIPES: int = _settings.lock_stripes
+VERSION: Final[str] = _settings.version
+BASE_PATH: Final[Path] = _settings.base_path
+HOST: Final[str] = _settings.host
+PORT: Final[int] = _settings.port
+LOG_FILE: Final[Path] = _settings.log_file
+USE_O_DIRECT: Final[bool] = _settings.use_o_direct
+MAX_UPLOAD_BYTES: Final[int] = _settings.max_upload_bytes
+SHARD_PREFIX_LEN: Final[int] = _settings.shard_prefix_len
+EXISTS_CACHE_TTL: Final[float] = _settings.exists_cache_ttl
+EXISTS_CACHE_SIZE: Final[int] = _settings.exists_cache_size
 
-CLIENT_MAX_CONNECTIONS: int = _settings.client_max_connections
-CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = _settings.client_max_keepalive
-CLIENT_REQUEST_TIMEOUT_SECONDS: float = _settings.client_request_timeout_seconds
+CLIENT_MAX_CONNECTIONS: Final[int] = _settings.client_max_connections
+CLIENT_MAX_KEEPALIVE_CONNECTIONS: Final[int] = _settings.client_max_keepalive
+CLIENT_REQUEST_TIMEOUT_SECONDS: Final[float] = _settings.client_request_timeout_seconds
+CLIENT_HTTP2: Final[bool] = _settings.client_http2
@@ -0,0 +1,295 @@
+"""
+Synchronous, fsync'ed file writes, optionally bypassing the page cache.
+
+``O_DIRECT`` requires the buffer address, file offset and length of every write
+to be aligned to the device block size. Content is copied into an anonymous
+``mmap`` (always page‐aligned), zero‐padded to a whole number of blocks, written
+in one call and then truncated back to its real size. Streams of chunks are
+staged through one aligned buffer and written a full buffer at a time, so only
+the final write carries padding. Buffers up to
+`POOL_MAX_BUFFER` bytes are recycled through a small pool instead of being
+mapped and unmapped for every write.
+
+These functions block; the Storage Service runs them in a worker thread.
+"""
+
+import errno
+import logging
+import mmap
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+#: Block alignment used for ``O_DIRECT`` buffers and lengths.
+ALIGNMENT: int = 4096
+
+#: Largest buffer kept for reuse; bigger writes map a one‐off buffer.
+POOL_MAX_BUFFER: int = 4 * 1024 * 1024
+
+#: Idle buffers kept per size class.
+POOL_BUFFERS_PER_CLASS: int = 8
+
+#: Staging buffer size for `copy_direct`; a power of two, so it is pooled.
+COPY_BUFFER: int = 1024 * 1024
+
+# Source for the zero padding after the content in a reused buffer.
+_ZEROS = bytes(ALIGNMENT)
+
+
+class AlignedBufferPool:
+    """
+    Thread‐safe free lists of page‐aligned anonymous ``mmap`` buffers.
+
+    Buffers are handed out by power‐of‐two size class (at least `ALIGNMENT`),
+    so a buffer fits any request in its class. Contents are not cleared
+    between uses: callers must overwrite or zero every byte they write out.
+
+    Attributes:
+        max_buffer (int): Largest size class that is pooled.
+        per_class (int): Maximum idle buffers kept per size class.
+    """
+
+    def __init__(
+        self,
+        max_buffer: int = POOL_MAX_BUFFER,
+        per_class: int = POOL_BUFFERS_PER_CLASS,
+    ) -> None:
+        self.max_buffer = max_buffer
+        self.per_class = per_class
+        self._lock = threading.Lock()
+        self._free: Dict[int, List[mmap.mmap]] = {}
+
+    def acquire(self, size: int) -> mmap.mmap:
+        """
+        Return a buffer of at least `size` bytes, rounded up to `ALIGNMENT`.
+
+        Args:
+            size (int): Minimum buffer length.
+
+        Returns:
+            mmap.mmap: A pooled or freshly mapped buffer.
+        """
+        size_class = max(ALIGNMENT, 1 << (size - 1).bit_length())
+        if size_class > self.max_buffer:
+            return mmap.mmap(-1, -(-size // ALIGNMENT) * ALIGNMENT)
+        with self._lock:
+            free = self._free.get(size_class)
+            if free:
+                return free.pop()
+        return mmap.mmap(-1, size_class)
+
+    def release(self, buf: mmap.mmap) -> None:
+        """
+        Return a buffer obtained from `acquire`; unpooled sizes are unmapped.
+
+        Args:
+            buf (mmap.mmap): Buffer to give back.
+        """
+        size = len(buf)
+        if size <= self.max_buffer and size & (size - 1) == 0:
+            with self._lock:
+                free = self._free.setdefault(size, [])
+                if len(free) < self.per_class:
+                    free.append(buf)
+                    return
+        buf.close()
+
+
+_pool = AlignedBufferPool()
+
+
+def write_all(fd: int, data: bytes | memoryview) -> None:
+    """
+    Write all of `data` to `fd`, retrying after short writes.
+
+    Args:
+        fd (int): Open file descriptor.
+        data (bytes | memoryview): Bytes to write.
+
+    Raises:
+        OSError: If a write fails.
+    """
+    view = memoryview(data)
+    written = 0
+    while written < len(view):
+        written += os.write(fd, view[written:])
+
+
+def write_buffered(path: str, content: bytes, dir_fd: Optional[int] = None) -> None:
+    """
+    Write `content` to `path` through the page cache and fsync it.
+
+    Uses raw ``os.write`` calls on the descriptor: the content is already in
+    memory, so a ``BufferedWriter`` would only add a copy into its buffer.
+    Also used by `write_direct` when ``O_DIRECT`` is unavailable.
+
+    Args:
+        path (str): Destination file; created or truncated.
+        content (bytes): Bytes to write.
+        dir_fd (Optional[int]): Directory descriptor `path` is relative to.
+
+    Raises:
+        OSError: If opening or writing the file fails.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        write_all(fd, content)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def copy_buffered(
+    path: str, chunks: Iterable[bytes], dir_fd: Optional[int] = None
+) -> None:
+    """
+    Write every chunk of `chunks` to `path` through the page cache and fsync it.
+
+    Also used by `copy_direct` when ``O_DIRECT`` is unavailable.
+
+    Args:
+        path (str): Destination file; created or truncated.
+        chunks (Iterable[bytes]): Content, consumed in order.
+        dir_fd (Optional[int]): Directory descriptor `path` is relative to.
+
+    Raises:
+        OSError: If opening or writing the file fails.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        for chunk in chunks:
+            write_all(fd, chunk)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _open_direct(path: str, dir_fd: Optional[int]) -> Optional[int]:
+    """
+    Open `path` for writing with ``O_DIRECT``.
+
+    Args:
+        path (str): Destination file; created or truncated.
+        dir_fd (Optional[int]): Directory descriptor `path` is relative to.
+
+    Returns:
+        Optional[int]: The descriptor, or None if the platform has no
+        ``O_DIRECT`` or the filesystem rejects it (``EINVAL``, e.g. older
+        tmpfs).
+
+    Raises:
+        OSError: If opening fails for any other reason.
+    """
+    o_direct = getattr(os, "O_DIRECT", 0)
+    if not o_direct:
+        return None
+    try:
+        return os.open(
+            path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | o_direct,
+            0o644,
+            dir_fd=dir_fd,
+        )
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        logger.debug("O_DIRECT rejected for %s; using buffered write", path)
+        return None
+
+
+def write_direct(path: str, content: bytes, dir_fd: Optional[int] = None) -> None:
+    """
+    Write `content` to `path` with ``O_DIRECT``, bypassing the page cache.
+
+    The file is fsync'ed before returning so its final size is durable too.
+
+    Falls back to a buffered write on platforms without ``O_DIRECT`` and on
+    filesystems that reject it (``EINVAL``, e.g. older tmpfs).
+
+    Args:
+        path (str): Destination file; created or truncated.
+        content (bytes): Bytes to write.
+        dir_fd (Optional[int]): Directory descriptor `path` is relative to.
+
+    Raises:
+        OSError: If opening or writing the file fails.
+    """
+    fd = _open_direct(path, dir_fd)
+    if fd is None:
+        write_buffered(path, content, dir_fd)
+        return
+
+    try:
+        size = len(content)
+        if size:
+            aligned = -(-size // ALIGNMENT) * ALIGNMENT
+            buf = _pool.acquire(size)
+            try:
+                buf[:size] = content
+                # The buffer may hold a previous file's bytes past `size`
+                buf[size:aligned] = _ZEROS[: aligned - size]
+                with memoryview(buf) as view:
+                    write_all(fd, view[:aligned])
+            finally:
+                _pool.release(buf)
+            os.ftruncate(fd, size)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def copy_direct(
+    path: str, chunks: Iterable[bytes], dir_fd: Optional[int] = None
+) -> None:
+    """
+    Write every chunk of `chunks` to `path` with ``O_DIRECT``.
+
+    Chunks of any size are gathered into a pooled `COPY_BUFFER`‐byte buffer
+    that is written out whenever it fills; the tail is zero‐padded to a block
+    and the file truncated back to its real size before the fsync. Falls back
+    to `copy_buffered` like `write_direct` does.
+
+    Args:
+        path (str): Destination file; created or truncated.
+        chunks (Iterable[bytes]): Content, consumed in order.
+        dir_fd (Optional[int]): Directory descriptor `path` is relative to.
+
+    Raises:
+        OSError: If opening or writing the file fails.
+    """
+    fd = _open_direct(path, dir_fd)
+    if fd is None:
+        copy_buffered(path, chunks, dir_fd)
+        return
+
+    try:
+        buf = _pool.acquire(COPY_BUFFER)
+        try:
+            with memoryview(buf) as view:
+                capacity = len(view)
+                fill = total = 0
+                for chunk in chunks:
+                    with memoryview(chunk) as src:
+                        pos = 0
+                        while pos < len(src):
+                            n = min(len(src) - pos, capacity - fill)
+                            view[fill : fill + n] = src[pos : pos + n]
+                            fill += n
+                            pos += n
+                            if fill == capacity:
+                                write_all(fd, view)
+                                total += fill
+                                fill = 0
+                if fill:
+                    aligned = -(-fill // ALIGNMENT) * ALIGNMENT
+                    view[fill:aligned] = _ZEROS[: aligned - fill]
+                    write_all(fd, view[:aligned])
+                    total += fill
+        finally:
+            _pool.release(buf)
+        os.ftruncate(fd, total)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -15,6 +15,10 @@ class SaveImageError(StorageError):
     """Raised when saving an image file fails."""
 
 
+class FileTooLargeError(StorageError):
+    """Raised when an uploaded file exceeds the configured size limit."""
+
+
 class PDFNotFoundError(StorageError):
     """Raised when a requested PDF file does not exist."""
 
@@ -25,3 +29,7 @@ class ImageNotFoundError(StorageError):
 
 class DeleteDocumentError(StorageError):
     """Raised when deleting a document or its associated files fails."""
+
+
+class InvalidDocumentIdError(StorageError):
+    """Raised when a document ID could resolve outside the storage directories."""
@@ -1,11 +1,24 @@
 from typing import List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from docai.shared.models.dto.meta import Meta
 from docai.shared.models.dto.error import ErrorResponse
 
-__all__ = ["ErrorResponse"]
+__all__ = [
+    "SavePDFData",
+    "SavePDFResponse",
+    "SaveImageData",
+    "SaveImageResponse",
+    "SaveImagesData",
+    "SaveImagesResponse",
+    "DeleteDocumentData",
+    "DeleteDocumentResponse",
+    "ErrorResponse",
+]
+
+# Response models are immutable and reject unknown fields.
+_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True, populate_by_name=True)
 
 
 class SavePDFData(BaseModel):
@@ -17,6 +30,8 @@ class SavePDFData(BaseModel):
         pdf_path (str): Filesystem path where the PDF is stored.
     """
 
+    model_config = _MODEL_CONFIG
+
     doc_id: str = Field(
         ...,
         description="Unique identifier for the document",
@@ -38,6 +53,8 @@ class SavePDFResponse(BaseModel):
         meta (Meta): Metadata about the response (timestamp, version, etc.).
     """
 
+    model_config = _MODEL_CONFIG
+
     data: SavePDFData = Field(..., description="Saved PDF details")
     meta: Meta = Field(..., description="Response metadata")
 
@@ -52,6 +69,8 @@ class SaveImageData(BaseModel):
         image_path (str): Filesystem path where the image is stored.
     """
 
+    model_config = _MODEL_CONFIG
+
     doc_id: str = Field(
         ...,
         description="Unique identifier for the document",
@@ -76,10 +95,46 @@ class SaveImageResponse(BaseModel):
         meta (Meta): Metadata about the response (timestamp, version, etc.).
     """
 
+    model_config = _MODEL_CONFIG
+
     data: SaveImageData = Field(..., description="Saved image details")
     meta: Meta = Field(..., description="Response metadata")
 
 
+class SaveImagesData(BaseModel):
+    """
+    The payload for a successful batch image‐save response.
+
+    Attributes:
+        doc_id (str): Unique identifier for the document.
+        images (List[SaveImageData]): One entry per saved page image.
+    """
+
+    model_config = _MODEL_CONFIG
+
+    doc_id: str = Field(
+        ...,
+        description="Unique identifier for the document",
+        examples=["doc_123456789"],
+    )
+    images: List[SaveImageData] = Field(..., description="Saved image details")
+
+
+class SaveImagesResponse(BaseModel):
+    """
+    Response model for saving a batch of images, with metadata.
+
+    Attributes:
+        data (SaveImagesData): The saved‐images payload.
+        meta (Meta): Metadata about the response (timestamp, version, etc.).
+    """
+
+    model_config = _MODEL_CONFIG
+
+    data: SaveImagesData = Field(..., description="Saved images details")
+    meta: Meta = Field(..., description="Response metadata")
+
+
 class DeleteDocumentData(BaseModel):
     """
     The payload for a successful document deletion response.
@@ -89,6 +144,8 @@ class DeleteDocumentData(BaseModel):
         detail (str): A confirmation message.
     """
 
+    model_config = _MODEL_CONFIG
+
     doc_id: str = Field(
         ...,
         description="Unique identifier for the deleted document",
@@ -110,5 +167,7 @@ class DeleteDocumentResponse(BaseModel):
         meta (Meta): Metadata about the response (timestamp, version, etc.).
     """
 
+    model_config = _MODEL_CONFIG
+
     data: DeleteDocumentData = Field(..., description="Deleted document details")
     meta: Meta = Field(..., description="Response metadata")
@@ -1,162 +1,777 @@
 """
 Asynchronous, file‐based storage service.
 
-Uses aiofiles for non‐blocking I/O and per‐document asyncio locks
-to coordinate concurrent access to the same document’s files.
+Blocking file operations run in worker threads. Files are written to a
+temporary name and atomically renamed into place, so writers never need a lock; a lazily
+created per‐document asyncio lock only serializes deletions.
 """
 
 import asyncio
 import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-
-import aiofiles
-import aiofiles.os
-
+from typing import (
+    BinaryIO,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
+from weakref import WeakValueDictionary
+
+from docai.storage.cache import TTLCache
+from docai.storage.config import (
+    EXISTS_CACHE_SIZE,
+    EXISTS_CACHE_TTL,
+    MAX_UPLOAD_BYTES,
+    SHARD_PREFIX_LEN,
+    USE_O_DIRECT,
+)
+from docai.storage.direct_io import (
+    copy_buffered,
+    copy_direct,
+    write_buffered,
+    write_direct,
+)
 from docai.storage.exceptions import (
     DeleteDocumentError,
+    FileTooLargeError,
     ImageNotFoundError,
+    InvalidDocumentIdError,
     PDFNotFoundError,
     SaveImageError,
     SavePDFError,
 )
-from docai.storage.config import LOCK_STRIPES
 
 logger = logging.getLogger(__name__)
 
+#: Bytes read per chunk when copying a file object to disk.
+COPY_CHUNK_SIZE: int = 1024 * 1024
+
+#: Image count from which a delete spreads its unlinks over `_UNLINK_EXECUTOR`.
+PARALLEL_UNLINK_THRESHOLD: int = 16
+
+# Threads are only started on first use; each unlink releases the GIL.
+_UNLINK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="storage-unlink",
+)
+
 
 class StorageService:
     """Async file‐system storage service for PDFs and page images."""
 
-    def __init__(self, base_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        use_o_direct: Optional[bool] = None,
+        max_upload_bytes: Optional[int] = None,
+        exists_cache_ttl: Optional[float] = None,
+        shard_prefix_len: Optional[int] = None,
+    ) -> None:
         """
-        Initialize storage directories and per‐document locks.
+        Initialize storage directories and the per‐document lock map.
 
         Args:
             base_path (Optional[Path]): Base directory for storage (defaults to './data').
+            use_o_direct (Optional[bool]): Write files with O_DIRECT
+                (defaults to the `use_o_direct` setting).
+            max_upload_bytes (Optional[int]): Largest file accepted by a save
+                (defaults to the `max_upload_bytes` setting).
+            exists_cache_ttl (Optional[float]): Seconds a positive existence
+                check is remembered; 0 disables the cache
+                (defaults to the `exists_cache_ttl` setting).
+            shard_prefix_len (Optional[int]): Store each document's files under
+                a sub‐directory named after the first N characters of its ID;
+                0 keeps a flat layout (defaults to the `shard_prefix_len` setting).
         """
         self.base_path: Path = base_path or Path("./data")
         self.pdf_dir: Path = self.base_path / "pdfs"
         self.image_dir: Path = self.base_path / "images"
-        # Bounded “striped” lock pool — prevents unbounded growth
-        self._num_stripes: int = LOCK_STRIPES
-        self._locks: List[asyncio.Lock] = [
-            asyncio.Lock() for _ in range(self._num_stripes)
-        ]
+        # Plain-string prefixes: hot paths build file paths by concatenation
+        # and only wrap the result in a Path at the return boundary.
+        self._pdf_prefix: str = f"{self.pdf_dir}{os.sep}"
+        self._image_prefix: str = f"{self.image_dir}{os.sep}"
+        self._shard_prefix_len: int = (
+            SHARD_PREFIX_LEN if shard_prefix_len is None else shard_prefix_len
+        )
+        self._use_o_direct: bool = (
+            USE_O_DIRECT if use_o_direct is None else use_o_direct
+        )
+        self._max_upload_bytes: int = (
+            MAX_UPLOAD_BYTES if max_upload_bytes is None else max_upload_bytes
+        )
+        # Paths known to exist; only positive results are cached so a file
+        # saved by another process is never hidden behind a stale miss.
+        # Deletes are only seen by this process, hence off by default.
+        # Only existence is cached: responses stat the file themselves, so
+        # a file replaced by another worker is served with fresh headers.
+        self._exists_cache: TTLCache[str, bool] = TTLCache(
+            maxsize=EXISTS_CACHE_SIZE,
+            ttl=EXISTS_CACHE_TTL if exists_cache_ttl is None else exists_cache_ttl,
+        )
+        # Locks are created on demand and dropped once no coroutine holds them
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+        # Shard directories this service has already created
+        self._known_dirs: Set[str] = set()
+        # Bumped whenever deletions drop cache entries; a save only caches
+        # its file if no delete finished while it was writing.
+        self._delete_generation: int = 0
         self._ensure_directories()
+        # Descriptors of the two storage roots; blocking file operations
+        # resolve names relative to them instead of walking the full path.
+        self._pdf_dir_fd: Optional[int] = self._open_dir(self.pdf_dir)
+        self._image_dir_fd: Optional[int] = self._open_dir(self.image_dir)
+        # Descriptors replaced by `_refresh_dir_fds`; worker threads may
+        # still be using them, so they are only closed with the service.
+        self._retired_fds: List[int] = []
+
+    @staticmethod
+    def _open_dir(directory: Path) -> Optional[int]:
+        """
+        Open `directory` for use as a ``dir_fd``.
+
+        Args:
+            directory (Path): Directory to open.
+
+        Returns:
+            Optional[int]: The descriptor, or None where the platform does not
+            support ``dir_fd`` operations.
+        """
+        o_directory = getattr(os, "O_DIRECTORY", 0)
+        # os.replace is not listed separately; it shares os.rename's renameat
+        needed = {os.open, os.stat, os.unlink, os.rename}
+        if not o_directory or not needed.issubset(os.supports_dir_fd):
+            return None
+        return os.open(directory, os.O_RDONLY | o_directory)
+
+    def close(self) -> None:
+        """Close the storage directory descriptors; paths are used afterwards."""
+        for attr in ("_pdf_dir_fd", "_image_dir_fd"):
+            fd = getattr(self, attr, None)
+            if fd is not None:
+                setattr(self, attr, None)
+                os.close(fd)
+        retired = getattr(self, "_retired_fds", [])
+        while retired:
+            os.close(retired.pop())
+
+    def _refresh_dir_fds(self) -> bool:
+        """
+        Reopen root descriptors whose directory was removed or replaced.
+
+        A descriptor keeps pointing at the directory it opened, so after
+        ``pdfs/`` or ``images/`` is deleted (and maybe recreated) saves would
+        land in the unlinked directory. Each root's descriptor is compared
+        with a fresh ``stat`` of its path; on a mismatch the directory is
+        recreated if needed and reopened, and the shard‐directory and
+        existence caches are dropped. Costs an ``fstat`` and a ``stat`` per
+        root, so it runs once per save or delete and on existence misses.
+
+        Returns:
+            bool: True if any descriptor was replaced.
+        """
+        refreshed = False
+        for attr, directory in (
+            ("_pdf_dir_fd", self.pdf_dir),
+            ("_image_dir_fd", self.image_dir),
+        ):
+            fd = getattr(self, attr)
+            if fd is None:
+                continue
+            opened = os.fstat(fd)
+            try:
+                current = os.stat(str(directory))
+            except FileNotFoundError:
+                current = None
+            if current is not None and (current.st_dev, current.st_ino) == (
+                opened.st_dev,
+                opened.st_ino,
+            ):
+                continue
+            logger.warning("Storage directory was replaced, reopening: %s", directory)
+            os.makedirs(directory, exist_ok=True)
+            setattr(self, attr, self._open_dir(directory))
+            self._retired_fds.append(fd)
+            refreshed = True
+        if refreshed:
+            self._known_dirs.clear()
+            self._exists_cache.clear()
+        return refreshed
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _at(self, file_path: str) -> Tuple[Optional[int], str]:
+        """
+        Split a storage path into a directory descriptor and relative name.
+
+        Args:
+            file_path (str): Path under the PDF or image directory.
+
+        Returns:
+            Tuple[Optional[int], str]: ``(dir_fd, name)`` for use with the
+            ``dir_fd`` argument of `os` functions, or ``(None, file_path)``
+            if no descriptor applies.
+
+        Raises:
+            InvalidDocumentIdError: If the relative name would be empty or
+                absolute; ``dir_fd`` is ignored for absolute names, so the
+                call would escape the storage root.
+        """
+        if self._pdf_dir_fd is not None and file_path.startswith(self._pdf_prefix):
+            dir_fd, name = self._pdf_dir_fd, file_path[len(self._pdf_prefix) :]
+        elif self._image_dir_fd is not None and file_path.startswith(
+            self._image_prefix
+        ):
+            dir_fd, name = self._image_dir_fd, file_path[len(self._image_prefix) :]
+        else:
+            return None, file_path
+        if not name or os.path.isabs(name):
+            raise InvalidDocumentIdError(f"Unsafe storage path: {file_path!r}")
+        return dir_fd, name
 
     def _get_lock(self, doc_id: str) -> asyncio.Lock:
         """
-        Map a document ID to one of a fixed set of locks.
+        Return the lock for a document ID, creating it on first use.
 
-        This bounds the total number of Lock objects in memory.
+        The map only holds weak references, so a lock lives exactly as long
+        as some coroutine is using it.
 
         Args:
             doc_id (str): Unique document identifier.
 
         Returns:
-            asyncio.Lock: One of the striped locks.
+            asyncio.Lock: The lock for this document.
         """
-        idx = hash(doc_id) % self._num_stripes
-        return self._locks[idx]
+        lock = self._locks.get(doc_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[doc_id] = lock
+        return lock
 
     def _ensure_directories(self) -> None:
         """Ensure that both PDF and image directories exist on disk."""
         for directory in (self.pdf_dir, self.image_dir):
-            directory.mkdir(parents=True, exist_ok=True)
+            os.makedirs(directory, exist_ok=True)
             logger.info("Storage directory ensured: %s", directory)
 
-    async def save_pdf(self, doc_id: str, pdf_content: bytes) -> Path:
+    def _ensure_dir(self, directory: str) -> None:
+        """
+        Create a shard `directory` unless this service already has.
+
+        Args:
+            directory (str): Shard directory path.
+        """
+        if directory in self._known_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._known_dirs.add(directory)
+
+    def _check_doc_id(self, doc_id: str) -> None:
+        """
+        Reject document IDs that could resolve outside the storage directories.
+
+        An empty ID, or one shorter than the shard prefix, leaves a bare
+        separator where the shard name belongs and so yields an absolute
+        name; a separator, or a shard prefix of ``.`` or ``..``, walks out
+        of the root; and a NUL byte is refused by every filesystem call.
+        Dots elsewhere in an ID are harmless.
+
+        Args:
+            doc_id (str): Unique document identifier.
+
+        Raises:
+            InvalidDocumentIdError: If `doc_id` is empty, shorter than the
+                shard prefix, contains a path separator or NUL byte, or its
+                shard prefix is ``.`` or ``..``.
+        """
+        if (
+            not doc_id
+            or len(doc_id) < self._shard_prefix_len
+            or os.sep in doc_id
+            or (os.altsep and os.altsep in doc_id)
+            or "\0" in doc_id
+            or (
+                self._shard_prefix_len
+                and doc_id[: self._shard_prefix_len] in (".", "..")
+            )
+        ):
+            raise InvalidDocumentIdError(f"Invalid document ID: {doc_id!r}")
+
+    def _shard(self, doc_id: str) -> str:
+        """
+        Return the shard sub‐directory for a document, with a trailing separator.
+
+        Every storage path is built through here, so this is also where
+        document IDs are validated.
+
+        Args:
+            doc_id (str): Unique document identifier.
+
+        Returns:
+            str: ``"<prefix>/"``, or an empty string when sharding is disabled.
+
+        Raises:
+            InvalidDocumentIdError: If `doc_id` is not a valid document ID.
+        """
+        self._check_doc_id(doc_id)
+        if not self._shard_prefix_len:
+            return ""
+        return f"{doc_id[: self._shard_prefix_len]}{os.sep}"
+
+    def _shard_dir(self, root_prefix: str, doc_id: str) -> Optional[str]:
+        """
+        Return the shard directory of a document under one storage root.
+
+        Args:
+            root_prefix (str): `_pdf_prefix` or `_image_prefix`.
+            doc_id (str): Unique document identifier, already validated.
+
+        Returns:
+            Optional[str]: The directory, or None when sharding is disabled
+            (the roots themselves are created at construction).
+        """
+        if not self._shard_prefix_len:
+            return None
+        return f"{root_prefix}{doc_id[: self._shard_prefix_len]}"
+
+    def _pdf_path(self, doc_id: str) -> str:
+        """Return the on‐disk path of a document's PDF."""
+        return f"{self._pdf_prefix}{self._shard(doc_id)}{doc_id}.pdf"
+
+    def _image_path(self, doc_id: str, page_number: int) -> str:
+        """Return the on‐disk path of a document's page image."""
+        return f"{self._image_prefix}{self._shard(doc_id)}{doc_id}_p{page_number}.jpg"
+
+    def _exists(self, file_path: str) -> bool:
+        """
+        Return whether `file_path` is an existing regular file.
+
+        A cached positive answer skips the ``stat`` syscall entirely. A miss
+        is retried once if the storage roots turn out to have been replaced.
+        Names the filesystem rejects (too long, embedded NUL) count as missing.
+
+        Args:
+            file_path (str): Path to check.
+
+        Returns:
+            bool: True if the file exists.
+        """
+        if self._exists_cache.get(file_path):
+            return True
+        if not self._stat_regular(file_path) and not (
+            self._refresh_dir_fds() and self._stat_regular(file_path)
+        ):
+            return False
+        self._exists_cache.set(file_path, True)
+        return True
+
+    def _stat_regular(self, file_path: str) -> bool:
+        """Return whether `file_path` is a regular file, with one ``stat``."""
+        dir_fd, name = self._at(file_path)
+        try:
+            st = os.stat(name, dir_fd=dir_fd)
+        except (OSError, ValueError):
+            return False
+        return stat.S_ISREG(st.st_mode)
+
+    def _forget(self, file_paths: Sequence[str]) -> None:
+        """
+        Drop deleted files from the existence cache.
+
+        Must run after the files are unlinked, in the same synchronous step
+        as the generation bump: a save that renamed its file into place
+        before the unlink then either has its entry popped here or sees the
+        new generation and skips caching.
+
+        Args:
+            file_paths (Sequence[str]): Paths that were removed.
+        """
+        for file_path in file_paths:
+            self._exists_cache.pop(file_path)
+        self._delete_generation += 1
+
+    async def _write_atomic(
+        self,
+        file_path: str,
+        content: Union[bytes, BinaryIO],
+        shard_dir: Optional[str] = None,
+    ) -> int:
+        """
+        Write content to a temporary sibling file and rename it over `file_path`.
+
+        Readers see either the previous file or the complete new one, and
+        concurrent writers to the same path cannot interleave. Data is
+        fsync'ed before the rename so a crash cannot leave a truncated file
+        under the final name. The temporary file is removed by the worker
+        thread itself if anything fails: a cancelled save leaves its thread
+        running, so cleanup from here could race the thread's own open or
+        rename. In‐memory bytes are written, fsync'ed and renamed by
+        `_write_bytes` in a single worker‐thread hop; binary file objects
+        are copied the same way by `_write_fileobj`, capped at
+        `max_upload_bytes`. Both honour O_DIRECT.
+
+        Args:
+            file_path (str): Final destination of the file.
+            content (bytes | BinaryIO): Bytes, or a readable binary file
+                object, to write.
+            shard_dir (Optional[str]): Shard directory to create first, from
+                `_shard_dir`; never derived from `file_path`.
+
+        Returns:
+            int: Size of the stored file in bytes.
+
+        Raises:
+            FileTooLargeError: If a copied file object exceeds
+                `max_upload_bytes`.
+        """
+        self._refresh_dir_fds()
+        if shard_dir is not None:
+            self._ensure_dir(shard_dir)
+        tmp_path = f"{file_path}.tmp.{os.getpid()}.{uuid4().hex}"
+        generation = self._delete_generation
+        if isinstance(content, bytes):
+            st = await asyncio.to_thread(self._write_bytes, tmp_path, file_path, content)
+        else:
+            st = await asyncio.to_thread(
+                self._write_fileobj, tmp_path, file_path, content
+            )
+        if self._delete_generation == generation:
+            self._exists_cache.set(file_path, True)
+        return st.st_size
+
+    def _write_bytes(
+        self, tmp_path: str, file_path: str, content: bytes
+    ) -> os.stat_result:
+        """
+        Write `content` to `tmp_path`, fsync it and rename it over `file_path`.
+
+        Blocking; called through ``asyncio.to_thread`` so that a whole save
+        costs one thread hop instead of one per open/write/fsync/close/rename.
+        The temporary file is removed here if any step fails.
+
+        Args:
+            tmp_path (str): Temporary sibling of `file_path`.
+            file_path (str): Final destination of the file.
+            content (bytes): Bytes to write.
+
+        Returns:
+            os.stat_result: Status of the file now at `file_path`.
+        """
+        dir_fd, tmp_name = self._at(tmp_path)
+        try:
+            if self._use_o_direct:
+                write_direct(tmp_name, content, dir_fd)
+            else:
+                write_buffered(tmp_name, content, dir_fd)
+            return self._replace(tmp_path, file_path)
+        except BaseException:
+            self._unlink(tmp_path)
+            raise
+
+    def _write_fileobj(
+        self, tmp_path: str, file_path: str, src: BinaryIO
+    ) -> os.stat_result:
+        """
+        Copy `src` to `tmp_path`, fsync it and rename it over `file_path`.
+
+        Blocking, like `_write_bytes`: the whole copy runs in one worker
+        thread, reading `COPY_CHUNK_SIZE` bytes at a time, with O_DIRECT when
+        enabled, and removes the temporary file if any step fails.
+
+        Args:
+            tmp_path (str): Temporary sibling of `file_path`.
+            file_path (str): Final destination of the file.
+            src (BinaryIO): Readable binary file object, read to EOF.
+
+        Returns:
+            os.stat_result: Status of the file now at `file_path`.
+
+        Raises:
+            FileTooLargeError: If `src` exceeds `max_upload_bytes`.
+        """
+        dir_fd, tmp_name = self._at(tmp_path)
+
+        def chunks() -> Iterator[bytes]:
+            size = 0
+            while chunk := src.read(COPY_CHUNK_SIZE):
+                size += len(chunk)
+                self._check_size(size)
+                yield chunk
+
+        copy = copy_direct if self._use_o_direct else copy_buffered
+        try:
+            copy(tmp_name, chunks(), dir_fd)
+            return self._replace(tmp_path, file_path)
+        except BaseException:
+            self._unlink(tmp_path)
+            raise
+
+    def _replace(self, tmp_path: str, file_path: str) -> os.stat_result:
+        """
+        Rename `tmp_path` over `file_path` and stat the result, via ``dir_fd``.
+
+        Args:
+            tmp_path (str): Temporary sibling of `file_path`.
+            file_path (str): Final destination of the file.
+
+        Returns:
+            os.stat_result: Status of the file now at `file_path`.
+        """
+        dir_fd, name = self._at(file_path)
+        tmp_name = self._at(tmp_path)[1]
+        os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        return os.stat(name, dir_fd=dir_fd)
+
+    def _check_size(self, size: int) -> None:
+        """Raise `FileTooLargeError` if `size` exceeds the configured maximum."""
+        if self._max_upload_bytes and size > self._max_upload_bytes:
+            raise FileTooLargeError(
+                f"File exceeds the {self._max_upload_bytes}-byte upload limit"
+            )
+
+    async def save_pdf(
+        self,
+        doc_id: str,
+        pdf_content: Union[bytes, BinaryIO],
+    ) -> Path:
         """
-        Asynchronously save PDF bytes to disk under a per‐document lock.
+        Asynchronously and atomically save a PDF to disk.
+
+        The content may be a binary file object, such as an upload's spooled
+        file, which is copied in chunks and never held in memory whole.
 
         Args:
             doc_id (str): Unique identifier for the document.
-            pdf_content (bytes): Raw bytes of the PDF file.
+            pdf_content (bytes | BinaryIO): Raw bytes of the PDF file, or a
+                file object holding them.
 
         Returns:
             Path: Path to the saved PDF file.
 
         Raises:
+            InvalidDocumentIdError: If `doc_id` is not a valid document ID.
+            FileTooLargeError: If a copied PDF exceeds `max_upload_bytes`.
             SavePDFError: If writing the file fails.
         """
-        file_path = self.pdf_dir / f"{doc_id}.pdf"
-        lock = self._get_lock(doc_id)
-        logger.debug(
-            "Attempting save_pdf: doc_id=%s path=%s size=%dB",
-            doc_id,
-            file_path,
-            len(pdf_content),
-        )
-        async with lock:
-            try:
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(pdf_content)
-                    logger.info("PDF saved: doc_id=%s path=%s", doc_id, file_path)
-                return file_path
-            except Exception as e:
-                logger.error(
-                    "Error saving PDF: doc_id=%s path=%s error=%s",
-                    doc_id,
-                    file_path,
-                    e,
-                    exc_info=True,
+        try:
+            file_path = self._pdf_path(doc_id)
+        except InvalidDocumentIdError as e:
+            logger.warning("Rejected save_pdf: %s", e)
+            raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Attempting save_pdf: doc_id=%s path=%s", doc_id, file_path)
+        try:
+            size = await self._write_atomic(
+                file_path, pdf_content, self._shard_dir(self._pdf_prefix, doc_id)
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "PDF saved: doc_id=%s path=%s size=%dB", doc_id, file_path, size
                 )
-                raise SavePDFError(f"Could not save PDF for {doc_id}") from e
+            return Path(file_path)
+        except FileTooLargeError:
+            logger.warning("PDF too large: doc_id=%s path=%s", doc_id, file_path)
+            raise
+        except Exception as e:
+            logger.error(
+                "Error saving PDF: doc_id=%s path=%s error=%s",
+                doc_id,
+                file_path,
+                e,
+                exc_info=True,
+            )
+            raise SavePDFError(f"Could not save PDF for {doc_id}") from e
 
     async def save_image(
-        self, doc_id: str, page_number: int, image_content: bytes
+        self,
+        doc_id: str,
+        page_number: int,
+        image_content: Union[bytes, BinaryIO],
     ) -> Path:
         """
-        Asynchronously save image bytes to disk under a per‐document lock.
+        Asynchronously and atomically save an image to disk.
+
+        Like `save_pdf`, a binary file object is copied in chunks rather
+        than read into memory.
 
         Args:
             doc_id (str): Unique identifier for the document.
             page_number (int): Zero-based page index.
-            image_content (bytes): Raw bytes of the JPEG image.
+            image_content (bytes | BinaryIO): Raw bytes of the JPEG image, or
+                a file object holding them.
 
         Returns:
             Path: Path to the saved image file.
 
         Raises:
+            InvalidDocumentIdError: If `doc_id` is not a valid document ID.
+            FileTooLargeError: If a copied image exceeds `max_upload_bytes`.
             SaveImageError: If writing the file fails.
         """
-        file_path = self.image_dir / f"{doc_id}_p{page_number}.jpg"
-        lock = self._get_lock(doc_id)
-        logger.debug(
-            "Attempting save_image: doc_id=%s page=%d path=%s size=%dB",
-            doc_id,
-            page_number,
-            file_path,
-            len(image_content),
+        try:
+            file_path = self._image_path(doc_id, page_number)
+        except InvalidDocumentIdError as e:
+            logger.warning("Rejected save_image: %s", e)
+            raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Attempting save_image: doc_id=%s page=%d path=%s",
+                doc_id,
+                page_number,
+                file_path,
+            )
+        try:
+            size = await self._write_atomic(
+                file_path, image_content, self._shard_dir(self._image_prefix, doc_id)
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Image saved: doc_id=%s page=%d path=%s size=%dB",
+                    doc_id,
+                    page_number,
+                    file_path,
+                    size,
+                )
+            return Path(file_path)
+        except FileTooLargeError:
+            logger.warning(
+                "Image too large: doc_id=%s page=%d path=%s",
+                doc_id,
+                page_number,
+                file_path,
+            )
+            raise
+        except Exception as e:
+            logger.error(
+                "Error saving image: doc_id=%s page=%d path=%s error=%s",
+                doc_id,
+                page_number,
+                file_path,
+                e,
+                exc_info=True,
+            )
+            raise SaveImageError(
+                f"Could not save image {page_number} for {doc_id}"
+            ) from e
+
+    async def save_images(
+        self, doc_id: str, pages: Sequence[Tuple[int, Union[bytes, BinaryIO]]]
+    ) -> List[Path]:
+        """
+        Asynchronously save several page images of one document in a batch.
+
+        All page writes are issued concurrently, each one atomic; file
+        objects are copied in chunks as in `save_image`. The batch is
+        all‐or‐nothing: if any page fails, the pages this call already
+        wrote are removed again, including any that replaced an earlier
+        version of the same page.
+
+        Args:
+            doc_id (str): Unique identifier for the document.
+            pages (Sequence[Tuple[int, bytes | BinaryIO]]): (page_number,
+                image_content) pairs.
+
+        Returns:
+            List[Path]: Paths to the saved image files, in the order given.
+
+        Raises:
+            InvalidDocumentIdError: If `doc_id` is not a valid document ID.
+            FileTooLargeError: If a copied image exceeds `max_upload_bytes`.
+            SaveImageError: If writing any of the files fails.
+            asyncio.CancelledError: If a page write was cancelled; re‐raised
+                unchanged.
+        """
+        try:
+            file_paths = [
+                self._image_path(doc_id, page_number) for page_number, _ in pages
+            ]
+        except InvalidDocumentIdError as e:
+            logger.warning("Rejected save_images: %s", e)
+            raise
+        shard_dir = self._shard_dir(self._image_prefix, doc_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Attempting save_images: doc_id=%s pages=%d", doc_id, len(file_paths)
+            )
+        results = await asyncio.gather(
+            *(
+                self._write_atomic(file_path, content, shard_dir)
+                for file_path, (_, content) in zip(file_paths, pages)
+            ),
+            return_exceptions=True,
         )
-        async with lock:
-            try:
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(image_content)
-                    logger.info(
-                        "Image saved: doc_id=%s page=%d path=%s",
-                        doc_id,
-                        page_number,
-                        file_path,
-                    )
-                return file_path
-            except Exception as e:
+        if any(isinstance(result, BaseException) for result in results):
+            await self._discard_batch(
+                [
+                    file_path
+                    for file_path, result in zip(file_paths, results)
+                    if not isinstance(result, BaseException)
+                ]
+            )
+        for (page_number, _), file_path, result in zip(pages, file_paths, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, FileTooLargeError):
+                logger.warning(
+                    "Image too large: doc_id=%s page=%d path=%s",
+                    doc_id,
+                    page_number,
+                    file_path,
+                )
+                raise result
+            if isinstance(result, BaseException):
                 logger.error(
                     "Error saving image: doc_id=%s page=%d path=%s error=%s",
                     doc_id,
                     page_number,
                     file_path,
-                    e,
-                    exc_info=True,
+                    result,
+                    exc_info=result,
                 )
                 raise SaveImageError(
                     f"Could not save image {page_number} for {doc_id}"
-                ) from e
+                ) from result
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Images saved: doc_id=%s pages=%d", doc_id, len(file_paths))
+        return [Path(file_path) for file_path in file_paths]
+
+    async def _discard_batch(self, file_paths: List[str]) -> None:
+        """
+        Remove the pages a failed `save_images` call had already written.
+
+        Args:
+            file_paths (List[str]): Paths written by the failed batch.
+        """
+        if not file_paths:
+            return
+        errors = await asyncio.to_thread(
+            lambda: [self._unlink(file_path) for file_path in file_paths]
+        )
+        self._forget(file_paths)
+        for file_path, error in zip(file_paths, errors):
+            if error is not None:
+                logger.error(
+                    "Error removing image of failed batch: path=%s error=%s",
+                    file_path,
+                    error,
+                    exc_info=error,
+                )
 
     async def get_pdf_path(self, doc_id: str) -> Path:
         """
-        Asynchronously check that the PDF exists and return its path.
+        Check that the PDF exists and return its path.
+
+        The check is a single synchronous ``stat``, skipped entirely while a
+        recent positive result is cached; dispatching it to a worker thread
+        would cost more than the syscall itself.
 
         Args:
             doc_id (str): Unique identifier for the document.
@@ -165,20 +780,27 @@ class StorageService:
             Path: Path to the PDF file.
 
         Raises:
-            PDFNotFoundError: If the file does not exist.
+            PDFNotFoundError: If the file does not exist or `doc_id` is invalid.
         """
-        file_path = self.pdf_dir / f"{doc_id}.pdf"
-        logger.debug("Checking PDF existence: doc_id=%s path=%s", doc_id, file_path)
-        exists = await aiofiles.os.path.exists(str(file_path))
-        if not exists:
+        try:
+            file_path = self._pdf_path(doc_id)
+        except InvalidDocumentIdError as e:
+            logger.warning("PDF not found: %s", e)
+            raise PDFNotFoundError(f"PDF for {doc_id} does not exist") from e
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking PDF existence: doc_id=%s path=%s", doc_id, file_path)
+        if not self._exists(file_path):
             logger.warning("PDF not found: doc_id=%s path=%s", doc_id, file_path)
             raise PDFNotFoundError(f"PDF for {doc_id} does not exist")
-        logger.info("PDF exists: doc_id=%s path=%s", doc_id, file_path)
-        return file_path
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PDF exists: doc_id=%s path=%s", doc_id, file_path)
+        return Path(file_path)
 
     async def get_image_path(self, doc_id: str, page_number: int) -> Path:
         """
-        Asynchronously check that the image exists and return its path.
+        Check that the image exists and return its path.
+
+        Like `get_pdf_path`, the check is a single, cached, synchronous ``stat``.
 
         Args:
             doc_id (str): Unique identifier for the document.
@@ -188,25 +810,24 @@ class StorageService:
             Path: Path to the image file.
 
         Raises:
-            ImageNotFoundError: If the file does not exist.
-        """
-        file_path = self.image_dir / f"{doc_id}_p{page_number}.jpg"
-        logger.debug(
-            "Checking image existence: doc_id=%s page=%d path=%s",
-            doc_id,
-            page_number,
-            file_path,
-        )
-        exists = await aiofiles.os.path.exists(str(file_path))
-        if exists:
-            logger.info(
-                "Image exists: doc_id=%s page=%d path=%s",
+            ImageNotFoundError: If the file does not exist or `doc_id` is
+                invalid.
+        """
+        try:
+            file_path = self._image_path(doc_id, page_number)
+        except InvalidDocumentIdError as e:
+            logger.warning("Image not found: %s", e)
+            raise ImageNotFoundError(
+                f"Image {page_number} for {doc_id} does not exist"
+            ) from e
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Checking image existence: doc_id=%s page=%d path=%s",
                 doc_id,
                 page_number,
                 file_path,
             )
-            return file_path
-        else:
+        if not self._exists(file_path):
             logger.warning(
                 "Image not found: doc_id=%s page=%d path=%s",
                 doc_id,
@@ -214,6 +835,96 @@ class StorageService:
                 file_path,
             )
             raise ImageNotFoundError(f"Image {page_number} for {doc_id} does not exist")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Image exists: doc_id=%s page=%d path=%s",
+                doc_id,
+                page_number,
+                file_path,
+            )
+        return Path(file_path)
+
+    @staticmethod
+    def _list_images(image_dir: str, doc_id: str) -> List[str]:
+        """
+        List the page images of a document with a single directory scan.
+
+        Args:
+            image_dir (str): Directory holding the document's images.
+            doc_id (str): Unique identifier for the document.
+
+        Returns:
+            List[str]: Paths of ``<doc_id>_p<N>.jpg`` files; empty if the
+            directory does not exist.
+        """
+        prefix = f"{doc_id}_p"
+        start = len(prefix)
+        try:
+            with os.scandir(image_dir) as it:
+                return [
+                    entry.path
+                    for entry in it
+                    if entry.name.startswith(prefix)
+                    and entry.name.endswith(".jpg")
+                    and entry.name[start:-4].isdigit()
+                ]
+        except FileNotFoundError:
+            return []
+
+    def _remove_images(
+        self, image_dir: str, doc_id: str
+    ) -> Tuple[List[str], List[Tuple[str, OSError]]]:
+        """
+        List and unlink a document's page images in one blocking pass.
+
+        Meant to run as a single worker‐thread job, rather than one thread
+        hop per file. Documents with at least `PARALLEL_UNLINK_THRESHOLD`
+        images have their unlinks spread over a shared thread pool.
+
+        Args:
+            image_dir (str): Directory holding the document's images.
+            doc_id (str): Unique identifier for the document.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, OSError]]]: Paths removed, and
+            ``(path, error)`` pairs for images that could not be removed.
+
+        Raises:
+            OSError: If the directory cannot be listed.
+        """
+        image_files = self._list_images(image_dir, doc_id)
+        if len(image_files) >= PARALLEL_UNLINK_THRESHOLD:
+            results = list(_UNLINK_EXECUTOR.map(self._unlink, image_files))
+        else:
+            results = [self._unlink(img_path) for img_path in image_files]
+
+        removed: List[str] = []
+        failures: List[Tuple[str, OSError]] = []
+        for img_path, error in zip(image_files, results):
+            if error is None:
+                removed.append(img_path)
+            else:
+                failures.append((img_path, error))
+        return removed, failures
+
+    def _unlink(self, file_path: str) -> Optional[OSError]:
+        """
+        Unlink a stored file, treating an already missing file as removed.
+
+        Args:
+            file_path (str): Path under the PDF or image directory.
+
+        Returns:
+            Optional[OSError]: The error if the file could not be removed.
+        """
+        dir_fd, name = self._at(file_path)
+        try:
+            os.unlink(name, dir_fd=dir_fd)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            return e
+        return None
 
     async def delete_document(self, doc_id: str) -> None:
         """
@@ -223,45 +934,49 @@ class StorageService:
             doc_id (str): Unique identifier for the document.
 
         Raises:
+            InvalidDocumentIdError: If `doc_id` is not a valid document ID.
             DeleteDocumentError: If any part of deletion fails.
         """
+        try:
+            self._check_doc_id(doc_id)
+        except InvalidDocumentIdError as e:
+            logger.warning("Rejected delete_document: %s", e)
+            raise
         lock = self._get_lock(doc_id)
-        logger.debug("Starting delete_document: doc_id=%s", doc_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Starting delete_document: doc_id=%s", doc_id)
         async with lock:
+            self._refresh_dir_fds()
             # Delete PDF
-            pdf_file = self.pdf_dir / f"{doc_id}.pdf"
-            if await aiofiles.os.path.exists(str(pdf_file)):
-                try:
-                    await aiofiles.os.remove(str(pdf_file))
-                    logger.info("Deleted PDF: doc_id=%s path=%s", doc_id, pdf_file)
-                except Exception as e:
+            pdf_file = self._pdf_path(doc_id)
+            if self._exists(pdf_file):
+                error = await asyncio.to_thread(self._unlink, pdf_file)
+                if error is not None:
                     logger.error(
                         "Error deleting PDF: doc_id=%s path=%s error=%s",
                         doc_id,
                         pdf_file,
-                        e,
-                        exc_info=True,
+                        error,
+                        exc_info=error,
                     )
                     raise DeleteDocumentError(
                         f"Could not delete PDF for {doc_id}"
-                    ) from e
+                    ) from error
+                logger.info("Deleted PDF: doc_id=%s path=%s", doc_id, pdf_file)
             else:
-                logger.debug("No PDF to delete for doc_id=%s", doc_id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("No PDF to delete for doc_id=%s", doc_id)
+            self._forget([pdf_file])
 
             # Delete images
+            image_dir = f"{self._image_prefix}{self._shard(doc_id)}"
             try:
-                entries = await aiofiles.os.listdir(str(self.image_dir))
-                for name in entries:
-                    if name.startswith(f"{doc_id}_p") and name.endswith(".jpg"):
-                        img_path = self.image_dir / name
-                        await aiofiles.os.remove(str(img_path))
-                        logger.info("Deleted image: %s", img_path)
-                        logger.debug(
-                            "Finished image deletion scan for doc_id=%s", doc_id
-                        )
+                removed, failures = await asyncio.to_thread(
+                    self._remove_images, image_dir, doc_id
+                )
             except Exception as e:
                 logger.error(
-                    "Error deleting images for doc_id=%s error=%s",
+                    "Error listing images for doc_id=%s error=%s",
                     doc_id,
                     e,
                     exc_info=True,
@@ -270,4 +985,20 @@ class StorageService:
                     f"Could not delete images for {doc_id}"
                 ) from e
 
-        logger.debug("Completed delete_document: doc_id=%s", doc_id)
+            self._forget(removed)
+            for img_path, result in failures:
+                logger.error(
+                    "Error deleting image: doc_id=%s path=%s error=%s",
+                    doc_id,
+                    img_path,
+                    result,
+                    exc_info=result,
+                )
+            if failures:
+                raise DeleteDocumentError(
+                    f"Could not delete {len(failures)} image(s) for {doc_id}"
+                ) from failures[0][1]
+            logger.info("Deleted images: doc_id=%s count=%d", doc_id, len(removed))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Completed delete_document: doc_id=%s", doc_id)
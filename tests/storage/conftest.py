@@ -1,59 +1,100 @@
+import asyncio
+from pathlib import Path
+
 import pytest
-import importlib
+import pytest_asyncio
+from pytest_asyncio import is_async_test
 
-import docai.storage.config as config_mod
 from docai.storage.storage import StorageService
 from docai.storage.client import StorageClient
-from docai.storage.api import app
+from docai.storage.api import app, get_storage_service
 
 from httpx import AsyncClient, ASGITransport
 
+RESOURCES = Path(__file__).parent.parent / "resources"
 
-@pytest.fixture(autouse=True)
-def isolate_storage(tmp_path, monkeypatch):
-    # 1) Redirect BASE_PATH in config to a fresh tmp_path
-    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path))
-    importlib.reload(config_mod)
 
-    # 2) Rebind the API’s global StorageService to our temp directory
-    new_svc = StorageService(config_mod.BASE_PATH)
-    import docai.storage.api as api_mod
+class _Samples(dict):
+    """Sample file bytes keyed by file name, read on first access."""
 
-    api_mod.s_service = new_svc
+    def __missing__(self, name: str) -> bytes:
+        data = self[name] = (RESOURCES / name).read_bytes()
+        return data
 
-    yield
-    # tmp_path is auto-cleaned, no teardown needed
+
+def pytest_collection_modifyitems(items):
+    """
+    Run every async storage test in the one session‐scoped event loop, so
+    tests don't each pay for a new loop and can share session clients.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """
+    Run async tests on uvloop when it is installed (e.g. via uvicorn[standard]),
+    matching the loop uvicorn picks in production; plain asyncio otherwise.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def samples():
+    """
+    Contents of tests/resources files, e.g. ``samples["sample_1.pdf"]``.
+
+    Each file is read at most once per session, and only if a test asks for it.
+    """
+    return _Samples()
 
 
 @pytest.fixture
+def storage_service(tmp_path):
+    """A StorageService rooted in this test's tmp_path."""
+    return StorageService(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def isolate_storage(storage_service):
+    # Serve API requests from this test's service; no module globals are
+    # touched, so tests stay hermetic (and safe to spread over processes)
+    app.dependency_overrides[get_storage_service] = lambda: storage_service
+    yield
+    app.dependency_overrides.pop(get_storage_service, None)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def api_client():
     """
     An httpx.AsyncClient that dispatches to FastAPI via ASGITransport.
     No real HTTP server needed.
+
+    Created once per session: the storage service is resolved per request,
+    so `isolate_storage` still gives each test a fresh directory.
     """
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         yield client
 
 
-@pytest.fixture
-async def storage_client():
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def storage_client(api_client):
     """
     A StorageClient pointed at our in-process API via ASGITransport.
     """
-    # 1) Create the ASGI-backed HTTPX client
-    transport = ASGITransport(app=app)
-    asgi_httpx = AsyncClient(transport=transport, base_url="http://testserver")
-
-    # 2) Instantiate your StorageClient against the same base_url
+    # 1) Instantiate your StorageClient against the same base_url
     client = StorageClient("http://testserver")
-    # 3) Tear down its real _client, replace with our ASGI-backed one
+    # 2) Tear down its real _client, replace with the shared ASGI-backed one
     await client._client.aclose()  # close the real pool
-    client._client = asgi_httpx
+    client._client = api_client
 
-    # 4) Yield the patched StorageClient
-    try:
-        yield client
-    finally:
-        # 5) Clean up the ASGI client
-        await client._client.aclose()
+    # 3) Yield the patched StorageClient; `api_client` closes the transport
+    yield client
@@ -1,4 +1,5 @@
 import asyncio
+import io
 from pathlib import Path
 
 import pytest
@@ -7,6 +8,7 @@ import httpx
 # fixtures from tests/storage/conftest.py:
 #  - storage_client
 #  - api_client
+#  - samples
 
 RESOURCES = Path(__file__).parent.parent.parent / "resources"
 
@@ -15,7 +17,7 @@ RESOURCES = Path(__file__).parent.parent.parent / "resources"
 
 
 @pytest.mark.asyncio
-async def test_pdf_lifecycle_success(storage_client):
+async def test_pdf_lifecycle_success(storage_client, samples):
     doc_id = "intg_pdf"
     sample = RESOURCES / "sample_1.pdf"
 
@@ -25,7 +27,7 @@ async def test_pdf_lifecycle_success(storage_client):
 
     # get
     data = await storage_client.get_pdf(doc_id)
-    assert data == sample.read_bytes()
+    assert data == samples[sample.name]
 
     # delete
     await storage_client.delete_document(doc_id)
@@ -43,6 +45,12 @@ async def test_pdf_get_without_save_returns_404(storage_client):
         assert exc.value.response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_pdf_get_overlong_doc_id_returns_404(api_client):
+    r = await api_client.get("/pdf/get", params={"doc_id": "x" * 300})
+    assert r.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_pdf_delete_without_save_is_noop(storage_client):
     await storage_client.delete_document("no_pdf")
@@ -54,7 +62,7 @@ async def test_pdf_delete_without_save_is_noop(storage_client):
 
 
 @pytest.mark.asyncio
-async def test_image_lifecycle_success(storage_client):
+async def test_image_lifecycle_success(storage_client, samples):
     doc_id, page = "intg_img", 1
     sample = RESOURCES / "sample_1_p1.jpg"
 
@@ -64,7 +72,7 @@ async def test_image_lifecycle_success(storage_client):
 
     # get
     data = await storage_client.get_image(doc_id, page)
-    assert data == sample.read_bytes()
+    assert data == samples[sample.name]
 
     # delete
     await storage_client.delete_document(doc_id)
@@ -93,30 +101,30 @@ async def test_image_delete_without_save_is_noop(storage_client):
 
 
 @pytest.mark.asyncio
-async def test_batch_save_and_get_pdfs(storage_client):
+async def test_batch_save_and_get_pdfs(storage_client, samples):
     doc_ids = ["sample_1", "sample_2", "sample_5"]
-    samples = [RESOURCES / f"{d}.pdf" for d in doc_ids]
+    sources = [RESOURCES / f"{d}.pdf" for d in doc_ids]
 
     # batch save
     save_paths = await asyncio.gather(
-        *(storage_client.save_pdf(d, p) for d, p in zip(doc_ids, samples))
+        *(storage_client.save_pdf(d, p) for d, p in zip(doc_ids, sources))
     )
     assert all(sp.endswith(f"{d}.pdf") for d, sp in zip(doc_ids, save_paths))
 
     # batch get
     contents = await asyncio.gather(*(storage_client.get_pdf(d) for d in doc_ids))
-    assert all(c == p.read_bytes() for p, c in zip(samples, contents))
+    assert all(c == samples[p.name] for p, c in zip(sources, contents))
 
 
 @pytest.mark.asyncio
-async def test_batch_get_multiple_pdfs_mixed(storage_client):
+async def test_batch_get_multiple_pdfs_mixed(storage_client, samples):
     # only sample_1 & sample_2 exist
     for d in ("sample_1", "sample_2"):
         src = RESOURCES / f"{d}.pdf"
         await storage_client._client.post(
             "/pdf/save",
             params={"doc_id": d},
-            files={"file": (src.name, src.read_bytes(), "application/pdf")},
+            files={"file": (src.name, samples[src.name], "application/pdf")},
         )
 
     doc_ids = ["sample_1", "missing1", "missing2"]
@@ -136,14 +144,14 @@ async def test_batch_get_multiple_pdfs_mixed(storage_client):
 
 
 @pytest.mark.asyncio
-async def test_batch_delete_multiple_pdfs(storage_client):
+async def test_batch_delete_multiple_pdfs(storage_client, samples):
     # copy in two PDFs
     for d in ("sample_1", "sample_2"):
         src = RESOURCES / f"{d}.pdf"
         await storage_client._client.post(
             "/pdf/save",
             params={"doc_id": d},
-            files={"file": (src.name, src.read_bytes(), "application/pdf")},
+            files={"file": (src.name, samples[src.name], "application/pdf")},
         )
 
     # batch delete
@@ -157,20 +165,43 @@ async def test_batch_delete_multiple_pdfs(storage_client):
 
 
 @pytest.mark.asyncio
-async def test_batch_save_and_get_images(storage_client):
+async def test_batch_save_and_get_images(storage_client, samples):
     doc = "batchimg"
     pages = [1, 2, 3]
-    samples = [RESOURCES / f"sample_1_p{p}.jpg" for p in pages]
+    sources = [RESOURCES / f"sample_1_p{p}.jpg" for p in pages]
 
     # batch save
     save_paths = await asyncio.gather(
-        *(storage_client.save_image(doc, p, s) for p, s in zip(pages, samples))
+        *(storage_client.save_image(doc, p, s) for p, s in zip(pages, sources))
     )
     assert all(sp.endswith(f"{doc}_p{p}.jpg") for p, sp in zip(pages, save_paths))
 
     # batch get
     contents = await asyncio.gather(*(storage_client.get_image(doc, p) for p in pages))
-    assert all(c == s.read_bytes() for s, c in zip(samples, contents))
+    assert all(c == samples[s.name] for s, c in zip(sources, contents))
+
+
+@pytest.mark.asyncio
+async def test_save_images_single_request(storage_client, samples):
+    doc = "batchreq"
+    pages = [1, 2, 3]
+    sources = [RESOURCES / f"sample_1_p{p}.jpg" for p in pages]
+
+    save_paths = await storage_client.save_images(doc, list(zip(pages, sources)))
+    assert all(sp.endswith(f"{doc}_p{p}.jpg") for p, sp in zip(pages, save_paths))
+
+    contents = await asyncio.gather(*(storage_client.get_image(doc, p) for p in pages))
+    assert all(c == samples[s.name] for s, c in zip(sources, contents))
+
+
+@pytest.mark.asyncio
+async def test_save_images_mismatched_lengths(api_client):
+    r = await api_client.post(
+        "/image/save_batch",
+        params={"doc_id": "x", "page_numbers": [0, 1]},
+        files=[("files", ("f.jpg", b"data", "image/jpeg"))],
+    )
+    assert r.status_code == 422
 
 
 @pytest.mark.asyncio
@@ -215,7 +246,7 @@ async def test_batch_delete_multiple_images(storage_client):
 
 
 @pytest.mark.asyncio
-async def test_race_save_pdf_same_doc(storage_client):
+async def test_race_save_pdf_same_doc(storage_client, samples):
     a = RESOURCES / "sample_1.pdf"
     b = RESOURCES / "sample_2.pdf"
     paths = await asyncio.gather(
@@ -224,11 +255,11 @@ async def test_race_save_pdf_same_doc(storage_client):
     )
     assert paths[0] == paths[1]
     final = await storage_client.get_pdf("racepdf")
-    assert final in (a.read_bytes(), b.read_bytes())
+    assert final in (samples[a.name], samples[b.name])
 
 
 @pytest.mark.asyncio
-async def test_race_get_delete_pdf(storage_client):
+async def test_race_get_delete_pdf(storage_client, samples):
     doc = "racepd2"
     sample = RESOURCES / "sample_1.pdf"
     await storage_client.save_pdf(doc, sample)
@@ -248,11 +279,11 @@ async def test_race_get_delete_pdf(storage_client):
     if isinstance(r_get, httpx.HTTPStatusError):
         assert r_get.response.status_code == 404
     else:
-        assert r_get == sample.read_bytes()
+        assert r_get == samples[sample.name]
 
 
 @pytest.mark.asyncio
-async def test_race_save_image_same_page(storage_client):
+async def test_race_save_image_same_page(storage_client, samples):
     sample = RESOURCES / "sample_1_p1.jpg"
     paths = await asyncio.gather(
         storage_client.save_image("raceimg", 1, sample),
@@ -260,11 +291,11 @@ async def test_race_save_image_same_page(storage_client):
     )
     assert paths[0] == paths[1]
     content = await storage_client.get_image("raceimg", 1)
-    assert content == sample.read_bytes()
+    assert content == samples[sample.name]
 
 
 @pytest.mark.asyncio
-async def test_race_get_delete_image(storage_client):
+async def test_race_get_delete_image(storage_client, samples):
     doc, page = "raceimg2", 2
     sample = RESOURCES / f"sample_1_p{page}.jpg"
     await storage_client.save_image(doc, page, sample)
@@ -282,7 +313,22 @@ async def test_race_get_delete_image(storage_client):
     if isinstance(r_get, httpx.HTTPStatusError):
         assert r_get.response.status_code == 404
     else:
-        assert r_get == sample.read_bytes()
+        assert r_get == samples[sample.name]
+
+
+@pytest.mark.asyncio
+async def test_get_pdf_serves_file_replaced_on_disk(
+    storage_client, storage_service, api_client
+):
+    doc = "replaced"
+    await storage_client.save_pdf(doc, io.BytesIO(b"%PDF-old"))
+    assert await storage_client.get_pdf(doc) == b"%PDF-old"
+
+    # another worker swaps the file; headers must follow the new content
+    (storage_service.pdf_dir / f"{doc}.pdf").write_bytes(b"%PDF-new-and-longer")
+    r = await api_client.get("/pdf/get", params={"doc_id": doc})
+    assert r.content == b"%PDF-new-and-longer"
+    assert int(r.headers["content-length"]) == len(r.content)
 
 
 # ── Validation & error‐path tests ─────────────────────────────────────────────
@@ -294,6 +340,62 @@ async def test_save_pdf_missing_file_param(api_client):
     assert r.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_save_pdf_too_large_returns_413(api_client, storage_service, monkeypatch):
+    monkeypatch.setattr(storage_service, "_max_upload_bytes", 4)
+    r = await api_client.post(
+        "/pdf/save",
+        params={"doc_id": "big"},
+        files={"file": ("big.pdf", b"PDFCONTENT", "application/pdf")},
+    )
+    assert r.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_save_image_too_large_returns_413(
+    api_client, storage_service, monkeypatch
+):
+    monkeypatch.setattr(storage_service, "_max_upload_bytes", 4)
+    r1 = await api_client.post(
+        "/image/save",
+        params={"doc_id": "big", "page_number": 0},
+        files={"file": ("big.jpg", b"JPEGDATA", "image/jpeg")},
+    )
+    assert r1.status_code == 413
+
+    r2 = await api_client.post(
+        "/image/save_batch",
+        params={"doc_id": "big", "page_numbers": [0, 1]},
+        files=[
+            ("files", ("p0.jpg", b"JPG", "image/jpeg")),
+            ("files", ("p1.jpg", b"JPEGDATA", "image/jpeg")),
+        ],
+    )
+    assert r2.status_code == 413
+    # the page that fit is not left behind by the rejected batch
+    assert not (storage_service.image_dir / "big_p0.jpg").exists()
+
+
+@pytest.mark.asyncio
+async def test_invalid_doc_id_returns_400(api_client):
+    r1 = await api_client.post(
+        "/pdf/save",
+        params={"doc_id": "a/b"},
+        files={"file": ("a.pdf", b"PDFCONTENT", "application/pdf")},
+    )
+    assert r1.status_code == 400
+
+    r2 = await api_client.delete("/document/delete", params={"doc_id": "a/b"})
+    assert r2.status_code == 400
+
+    r3 = await api_client.post(
+        "/image/save",
+        params={"doc_id": "", "page_number": 0},
+        files={"file": ("p0.jpg", b"JPG", "image/jpeg")},
+    )
+    assert r3.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_save_image_missing_params(api_client):
     r1 = await api_client.post("/image/save", params={"doc_id": "x"})
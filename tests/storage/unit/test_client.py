@@ -1,33 +1,109 @@
+import asyncio
+import inspect
 import io
-import time
 from pathlib import Path
 
 import pytest
-import respx
-import asyncio
+import pytest_asyncio
 import httpx
 from httpx import ReadTimeout
 
+import docai.storage.client as client_mod
 from docai.storage.client import StorageClient
 
+# fixtures from tests/storage/conftest.py:
+#  - samples
+
 RESOURCES = Path(__file__).parent.parent.parent / "resources"
 
+# Canned responses built once; `_Routes` serves each request a copy
+_PDF_SAVED = httpx.Response(200, json={"data": {"pdf_path": "p"}})
+_EMPTY_OK = httpx.Response(200, json={})
+
+
+def _upload(data: bytes, name: str) -> io.BytesIO:
+    """In-memory named upload for tests that only care about the request."""
+    bio = io.BytesIO(data)
+    bio.name = name
+    return bio
+
+
+class _Routes:
+    """
+    Responses keyed by (method, path), served by an httpx.MockTransport.
+
+    A value is either an `httpx.Response`, copied for every request, or a
+    (sync or async) callable building the response from the request.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+
+    async def __call__(self, request):
+        self.calls.append(request)
+        key = (request.method, request.url.path)
+        if key not in self.responses:
+            raise AssertionError(f"unexpected request: {key}")
+        response = self.responses[key]
+        if isinstance(response, httpx.Response):
+            return httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                content=response.content,
+            )
+        response = response(request)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+@pytest.fixture(scope="module")
+def module_routes():
+    return _Routes()
+
+
+@pytest.fixture
+def routes(module_routes):
+    """The module's routes, emptied so each test only sees its own."""
+    module_routes.responses = {}
+    module_routes.calls.clear()
+    return module_routes
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def client(module_routes):
+    """One StorageClient on an httpx.MockTransport, shared by the module."""
+    async with StorageClient(
+        "http://testserver", transport=httpx.MockTransport(module_routes)
+    ) as c:
+        yield c
+
 
 @pytest.mark.asyncio
 async def test_client_init_parameters(monkeypatch):
     seen = {}
 
     class DummyAsyncClient:
-        def __init__(self, *args, timeout=None, limits=None, **kwargs):
+        def __init__(self, *args, timeout=None, **kwargs):
             seen["timeout"] = timeout
-            seen["limits"] = limits
 
         async def aclose(self):
             pass
 
+    class DummyTransport:
+        def __init__(self, *args, limits=None, http2=None, **kwargs):
+            seen["limits"] = limits
+            seen["http2"] = http2
+
     monkeypatch.setattr(httpx, "AsyncClient", DummyAsyncClient)
+    monkeypatch.setattr(client_mod, "AsyncHTTPTransport", DummyTransport)
     client = StorageClient(
-        "http://testserver", timeout=2.5, max_connections=3, max_keepalive_connections=4
+        "http://testserver",
+        timeout=2.5,
+        max_connections=3,
+        max_keepalive_connections=4,
+        http2=False,
     )
 
     # httpx.Timeout stores our 2.5s in all four timeout slots:
@@ -38,9 +114,11 @@ async def test_client_init_parameters(monkeypatch):
     assert to.write == pytest.approx(2.5)
     assert to.pool == pytest.approx(2.5)
 
+    # limits must reach the transport, which owns the connection pool
     limits: httpx.Limits = seen["limits"]
     assert limits.max_connections == 3
     assert limits.max_keepalive_connections == 4
+    assert seen["http2"] is False
 
 
 @pytest.mark.asyncio
@@ -59,256 +137,279 @@ async def test_client_context_manager(monkeypatch):
     assert closed["flag"] is True
 
 
-@respx.mock
+# Happy/error pairs that differ only by route, status and expected outcome.
+# A `_Sample` stands for the bytes of a tests/resources file, taken from the
+# session `samples` fixture when the test runs.
+class _Sample(str):
+    pass
+
+
+_CALL_CASES = [
+    pytest.param(
+        "POST",
+        "/pdf/save",
+        200,
+        {"json": {"data": {"pdf_path": "data/pdfs/sample_1.pdf"}}},
+        lambda c: c.save_pdf("sample_1", RESOURCES / "sample_1.pdf"),
+        "data/pdfs/sample_1.pdf",
+        id="save_pdf_happy",
+    ),
+    pytest.param(
+        "POST",
+        "/pdf/save",
+        400,
+        {},
+        lambda c: c.save_pdf("bad", RESOURCES / "sample_1.pdf"),
+        httpx.HTTPStatusError,
+        id="save_pdf_http_error",
+    ),
+    pytest.param(
+        "POST",
+        "/image/save",
+        200,
+        {"json": {"data": {"image_path": "data/images/sample_1_p1.jpg"}}},
+        lambda c: c.save_image("sample_1", 1, RESOURCES / "sample_1_p1.jpg"),
+        "data/images/sample_1_p1.jpg",
+        id="save_image_happy",
+    ),
+    pytest.param(
+        "POST",
+        "/image/save",
+        500,
+        {},
+        lambda c: c.save_image("sample_1", 1, RESOURCES / "sample_1_p1.jpg"),
+        httpx.HTTPStatusError,
+        id="save_image_http_error",
+    ),
+    pytest.param(
+        "GET",
+        "/pdf/get",
+        200,
+        {"content": _Sample("sample_2.pdf")},
+        lambda c: c.get_pdf("sample_2"),
+        _Sample("sample_2.pdf"),
+        id="get_pdf_happy",
+    ),
+    pytest.param(
+        "GET",
+        "/pdf/get",
+        404,
+        {},
+        lambda c: c.get_pdf("missing"),
+        httpx.HTTPStatusError,
+        id="get_pdf_http_error",
+    ),
+    pytest.param(
+        "GET",
+        "/image/get",
+        200,
+        {"content": _Sample("sample_1_p1.jpg")},
+        lambda c: c.get_image("sample_1", 1),
+        _Sample("sample_1_p1.jpg"),
+        id="get_image_happy",
+    ),
+    pytest.param(
+        "GET",
+        "/image/get",
+        500,
+        {},
+        lambda c: c.get_image("sample_1", 1),
+        httpx.HTTPStatusError,
+        id="get_image_http_error",
+    ),
+    pytest.param(
+        "DELETE",
+        "/document/delete",
+        200,
+        {"json": {}},
+        lambda c: c.delete_document("whatever"),
+        None,
+        id="delete_document_happy",
+    ),
+    pytest.param(
+        "DELETE",
+        "/document/delete",
+        500,
+        {},
+        lambda c: c.delete_document("whatever"),
+        httpx.HTTPStatusError,
+        id="delete_document_http_error",
+    ),
+]
+
+
+@pytest.mark.parametrize("method,path,status,response_kwargs,call,expect", _CALL_CASES)
 @pytest.mark.asyncio
-async def test_save_pdf_happy():
-    pdf_path = "data/pdfs/sample_1.pdf"
-    r = respx.post("http://testserver/pdf/save").mock(
-        return_value=httpx.Response(200, json={"data": {"pdf_path": pdf_path}})
-    )
+async def test_client_call(
+    client, routes, samples, method, path, status, response_kwargs, call, expect
+):
+    def resolve(value):
+        return samples[value] if isinstance(value, _Sample) else value
+
+    response_kwargs = {k: resolve(v) for k, v in response_kwargs.items()}
+    routes.responses = {(method, path): httpx.Response(status, **response_kwargs)}
+    if isinstance(expect, type) and issubclass(expect, Exception):
+        with pytest.raises(expect):
+            await call(client)
+    else:
+        assert await call(client) == resolve(expect)
+    assert len(routes.calls) == 1
 
-    sample = RESOURCES / "sample_1.pdf"
-    async with StorageClient("http://testserver") as client:
-        result = await client.save_pdf("sample_1", sample)
-        assert result == pdf_path
-        assert r.called
 
-
-@respx.mock
 @pytest.mark.asyncio
-async def test_save_pdf_http_error():
-    respx.post("http://testserver/pdf/save").mock(return_value=httpx.Response(400))
-    sample = RESOURCES / "sample_1.pdf"
-    async with StorageClient("http://testserver") as client:
-        with pytest.raises(httpx.HTTPStatusError):
-            await client.save_pdf("bad", sample)
+async def test_save_pdf_streams_path_contents(client, routes, samples):
+    routes.responses = {("POST", "/pdf/save"): _PDF_SAVED}
+    await client.save_pdf("doc", RESOURCES / "sample_1.pdf")
+    request = routes.calls[0]
+    body = request.content
+    assert int(request.headers["content-length"]) == len(body)
+    assert samples["sample_1.pdf"] in body
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_save_pdf_with_file_like():
+async def test_save_pdf_with_file_like(client, routes, samples):
     # also accept file-like object
     pdf_path = "data/pdfs/doc.pdf"
-    respx.post("http://testserver/pdf/save").mock(
-        return_value=httpx.Response(200, json={"data": {"pdf_path": pdf_path}})
-    )
-    sample_bytes = (RESOURCES / "sample_1.pdf").read_bytes()
-    file_like = io.BytesIO(sample_bytes)
-    file_like.name = "foobar.pdf"
-
-    async with StorageClient("http://testserver") as client:
-        result = await client.save_pdf("doc", file_like)
-        assert result == pdf_path
-
-
-@respx.mock
-@pytest.mark.asyncio
-async def test_save_image_happy():
-    img_path = "data/images/sample_1_p1.jpg"
-    respx.post("http://testserver/image/save").mock(
-        return_value=httpx.Response(200, json={"data": {"image_path": img_path}})
-    )
-    sample = RESOURCES / "sample_1_p1.jpg"
-    async with StorageClient("http://testserver") as client:
-        result = await client.save_image("sample_1", 1, sample)
-        assert result == img_path
-
-
-@respx.mock
-@pytest.mark.asyncio
-async def test_save_image_http_error():
-    respx.post("http://testserver/image/save").mock(return_value=httpx.Response(500))
-    sample = RESOURCES / "sample_1_p1.jpg"
-    async with StorageClient("http://testserver") as client:
-        with pytest.raises(httpx.HTTPStatusError):
-            await client.save_image("sample_1", 1, sample)
-
+    routes.responses = {
+        ("POST", "/pdf/save"): httpx.Response(
+            200, json={"data": {"pdf_path": pdf_path}}
+        )
+    }
+    file_like = _upload(samples["sample_1.pdf"], "foobar.pdf")
 
-@respx.mock
-@pytest.mark.asyncio
-async def test_get_pdf_happy():
-    content = (RESOURCES / "sample_2.pdf").read_bytes()
-    respx.get("http://testserver/pdf/get").mock(
-        return_value=httpx.Response(200, content=content)
-    )
-    async with StorageClient("http://testserver") as client:
-        data = await client.get_pdf("sample_2")
-        assert data == content
+    result = await client.save_pdf("doc", file_like)
+    assert result == pdf_path
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_get_pdf_http_error():
-    respx.get("http://testserver/pdf/get").mock(return_value=httpx.Response(404))
-    async with StorageClient("http://testserver") as client:
-        with pytest.raises(httpx.HTTPStatusError):
-            await client.get_pdf("missing")
-
+async def test_save_images_happy(client, routes):
+    img_paths = ["data/images/sample_1_p1.jpg", "data/images/sample_1_p2.jpg"]
+    routes.responses = {
+        ("POST", "/image/save_batch"): httpx.Response(
+            200,
+            json={"data": {"images": [{"image_path": p} for p in img_paths]}},
+        )
+    }
+    pages = [(p, RESOURCES / f"sample_1_p{p}.jpg") for p in (1, 2)]
+    result = await client.save_images("sample_1", pages)
+    assert result == img_paths
 
-@respx.mock
-@pytest.mark.asyncio
-async def test_get_image_happy():
-    content = (RESOURCES / "sample_1_p1.jpg").read_bytes()
-    respx.get("http://testserver/image/get").mock(
-        return_value=httpx.Response(200, content=content)
-    )
-    async with StorageClient("http://testserver") as client:
-        data = await client.get_image("sample_1", 1)
-        assert data == content
+    request = routes.calls[0]
+    assert request.url.params.get_list("page_numbers") == ["1", "2"]
+    assert request.content.count(b'name="files"') == 2
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_get_image_http_error():
-    respx.get("http://testserver/image/get").mock(return_value=httpx.Response(500))
-    async with StorageClient("http://testserver") as client:
-        with pytest.raises(httpx.HTTPStatusError):
-            await client.get_image("sample_1", 1)
-
+async def test_get_pdf_chunked_without_content_length(client, routes):
+    async def body():
+        for chunk in (b"%PDF", b"-1.7", b"\n"):
+            yield chunk
 
-@respx.mock
-@pytest.mark.asyncio
-async def test_delete_document_happy():
-    respx.delete("http://testserver/document/delete").mock(
-        return_value=httpx.Response(200, json={})
-    )
-    async with StorageClient("http://testserver") as client:
-        # should complete without error
-        await client.delete_document("whatever")
+    routes.responses = {
+        ("GET", "/pdf/get"): lambda request: httpx.Response(200, content=body())
+    }
+    assert await client.get_pdf("chunked") == b"%PDF-1.7\n"
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_delete_document_http_error():
-    respx.delete("http://testserver/document/delete").mock(
-        return_value=httpx.Response(500)
-    )
-    async with StorageClient("http://testserver") as client:
-        with pytest.raises(httpx.HTTPStatusError):
-            await client.delete_document("whatever")
+async def test_full_flows_unit(client, routes, samples):
+    # stub all five routes up front: save and get for PDFs and images, delete
+    routes.responses = {
+        ("POST", "/pdf/save"): httpx.Response(
+            200, json={"data": {"pdf_path": "p.pdf"}}
+        ),
+        ("GET", "/pdf/get"): httpx.Response(200, content=samples["sample_5.pdf"]),
+        ("POST", "/image/save"): httpx.Response(
+            200, json={"data": {"image_path": "i.jpg"}}
+        ),
+        ("GET", "/image/get"): httpx.Response(
+            200, content=samples["sample_1_p1.jpg"]
+        ),
+        ("DELETE", "/document/delete"): _EMPTY_OK,
+    }
+
+    # PDF flow
+    p = await client.save_pdf("doc5", RESOURCES / "sample_5.pdf")
+    assert p == "p.pdf"
+    assert await client.get_pdf("doc5") == samples["sample_5.pdf"]
+    await client.delete_document("doc5")
+
+    # image flow
+    i = await client.save_image("docimg", 1, RESOURCES / "sample_1_p1.jpg")
+    assert i == "i.jpg"
+    assert await client.get_image("docimg", 1) == samples["sample_1_p1.jpg"]
+    await client.delete_document("docimg")
+
+    deletes = [r for r in routes.calls if r.method == "DELETE"]
+    assert len(deletes) == 2
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_full_pdf_flow_unit():
-    # stub save
-    respx.post("http://testserver/pdf/save").mock(
-        return_value=httpx.Response(200, json={"data": {"pdf_path": "p.pdf"}})
-    )
-    # stub get
-    pdf_bytes = (RESOURCES / "sample_5.pdf").read_bytes()
-    respx.get("http://testserver/pdf/get").mock(
-        return_value=httpx.Response(200, content=pdf_bytes)
-    )
-    # stub delete
-    respx.delete("http://testserver/document/delete").mock(
-        return_value=httpx.Response(200, json={})
-    )
-
-    sample = RESOURCES / "sample_5.pdf"
-    async with StorageClient("http://testserver") as client:
-        p = await client.save_pdf("doc5", sample)
-        assert p == "p.pdf"
-        b = await client.get_pdf("doc5")
-        assert b == pdf_bytes
-        await client.delete_document("doc5")
-
-
-@respx.mock
-@pytest.mark.asyncio
-async def test_full_image_flow_unit():
-    # stub save
-    respx.post("http://testserver/image/save").mock(
-        return_value=httpx.Response(200, json={"data": {"image_path": "i.jpg"}})
-    )
-    # stub get
-    img_bytes = (RESOURCES / "sample_1_p1.jpg").read_bytes()
-    respx.get("http://testserver/image/get").mock(
-        return_value=httpx.Response(200, content=img_bytes)
-    )
-    # stub delete
-    respx.delete("http://testserver/document/delete").mock(
-        return_value=httpx.Response(200, json={})
-    )
+async def test_base_url_trailing_slash(routes):
+    routes.responses = {("POST", "/pdf/save"): _PDF_SAVED}
 
-    sample = RESOURCES / "sample_1_p1.jpg"
-    async with StorageClient("http://testserver") as client:
-        i = await client.save_image("docimg", 1, sample)
-        assert i == "i.jpg"
-        b = await client.get_image("docimg", 1)
-        assert b == img_bytes
-        await client.delete_document("docimg")
-
-
-@respx.mock
-@pytest.mark.asyncio
-async def test_base_url_trailing_slash():
-    # route without double-slash
-    called = respx.post("http://svc/pdf/save").mock(
-        return_value=httpx.Response(200, json={"data": {"pdf_path": "p"}})
-    )
+    async with StorageClient(
+        "http://svc/", transport=httpx.MockTransport(routes)
+    ) as client:
+        await client.save_pdf("d", _upload(b"PDF", "x.pdf"))
 
-    async with StorageClient("http://svc/") as client:
-        await client.save_pdf("d", Path("tests/resources/sample_1.pdf"))
-        assert called.called
+    # no double slash between the base URL and the route
+    assert str(routes.calls[0].url).startswith("http://svc/pdf/save?")
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_save_pdf_file_like_no_name():
-    route = respx.post("http://svc/pdf/save").mock(
-        return_value=httpx.Response(200, json={"data": {"pdf_path": "pdf1"}})
-    )
+async def test_save_pdf_file_like_no_name(client, routes):
+    routes.responses = {
+        ("POST", "/pdf/save"): httpx.Response(200, json={"data": {"pdf_path": "pdf1"}})
+    }
 
     bio = io.BytesIO(b"PDF")
     # remove name attribute if any
     if hasattr(bio, "name"):
         delattr(bio, "name")
 
-    async with StorageClient("http://svc") as client:
-        await client.save_pdf("d1", bio)
+    await client.save_pdf("d1", bio)
 
     # ensure the multipart used 'file' as filename
-    assert b'filename="file"' in route.calls[0].request.content
+    assert b'filename="file"' in routes.calls[0].content
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_save_pdf_missing_data_raises():
-    respx.post("http://svc/pdf/save").mock(return_value=httpx.Response(200, json={}))
-    async with StorageClient("http://svc") as client:
-        with pytest.raises(KeyError):
-            await client.save_pdf("d", Path("tests/resources/sample_1.pdf"))
+async def test_save_pdf_missing_data_raises(client, routes, samples):
+    routes.responses = {("POST", "/pdf/save"): _EMPTY_OK}
+    with pytest.raises(KeyError):
+        await client.save_pdf("d", _upload(samples["sample_1.pdf"], "sample_1.pdf"))
 
 
 @pytest.mark.asyncio
-async def test_save_pdf_timeout(monkeypatch):
-    async def timeout_post(*args, **kwargs):
-        raise ReadTimeout("timed out")
-
-    monkeypatch.setattr("httpx.AsyncClient.post", timeout_post)
+async def test_save_pdf_timeout(client, routes, samples):
+    def timeout(request):
+        raise ReadTimeout("timed out", request=request)
 
-    async with StorageClient("http://svc", timeout=0.01) as client:
-        with pytest.raises(ReadTimeout):
-            await client.save_pdf("d", Path("tests/resources/sample_1.pdf"))
+    routes.responses = {("POST", "/pdf/save"): timeout}
+    with pytest.raises(ReadTimeout):
+        await client.save_pdf("d", _upload(samples["sample_1.pdf"], "sample_1.pdf"))
 
 
-@respx.mock
 @pytest.mark.asyncio
-async def test_client_concurrent_requests():
-    # simulate a 0.1s delay in response
-    async def delayed_response(request):
-        await asyncio.sleep(0.1)
+async def test_client_concurrent_requests(client, routes, samples):
+    # each response is held until both requests are in flight at once
+    in_flight = 0
+    both = asyncio.Event()
+
+    async def rendezvous(request):
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight >= 2:
+            both.set()
+        await asyncio.wait_for(both.wait(), timeout=1.0)
         return httpx.Response(200, json={"data": {"pdf_path": "p"}})
 
-    respx.post("http://svc/pdf/save").mock(side_effect=delayed_response)
+    routes.responses = {("POST", "/pdf/save"): rendezvous}
 
-    async with StorageClient("http://svc", max_connections=2) as client:
-        start = time.monotonic()
-        await asyncio.gather(
-            client.save_pdf("a", Path("tests/resources/sample_1.pdf")),
-            client.save_pdf("b", Path("tests/resources/sample_2.pdf")),
-        )
-        elapsed = time.monotonic() - start
-        # with 2 max_connections, both should run in parallel -> ~0.1s
-        assert elapsed < 0.15
+    # the shared client must not serialize requests
+    await asyncio.gather(
+        client.save_pdf("a", _upload(samples["sample_1.pdf"], "sample_1.pdf")),
+        client.save_pdf("b", _upload(samples["sample_2.pdf"], "sample_2.pdf")),
+    )
+    assert both.is_set()
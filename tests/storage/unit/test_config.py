@@ -1,32 +1,35 @@
 from pathlib import Path
-import importlib
-from pathlib import Path
-
-from docai.storage import config
-
-
-def test_host_default(monkeypatch):
-    monkeypatch.delenv("STORAGE_HOST", raising=False)
-    importlib.reload(config)
-    assert config.HOST == "0.0.0.0"
 
+import pytest
 
-def test_host_override(monkeypatch):
-    monkeypatch.setenv("STORAGE_HOST", "127.231.19.9")
-    importlib.reload(config)
-    assert config.HOST == "127.231.19.9"
-
-
-def test_port_default(monkeypatch):
-    monkeypatch.delenv("STORAGE_PORT", raising=False)
-    importlib.reload(config)
-    assert config.PORT == 8000
+from docai.storage import config
 
 
-def test_port_override(monkeypatch):
-    monkeypatch.setenv("STORAGE_PORT", "8080")
-    importlib.reload(config)
-    assert config.PORT == 8080
+@pytest.mark.parametrize(
+    "env,field,expected",
+    [
+        ("STORAGE_HOST", "host", "0.0.0.0"),
+        ("STORAGE_PORT", "port", 8000),
+        ("STORAGE_BASE_PATH", "base_path", Path("data")),
+        ("STORAGE_EXISTS_CACHE_TTL", "exists_cache_ttl", 0.0),
+    ],
+)
+def test_setting_default(monkeypatch, env, field, expected):
+    monkeypatch.delenv(env, raising=False)
+    assert getattr(config.load_settings(), field) == expected
+
+
+@pytest.mark.parametrize(
+    "env,value,field,expected",
+    [
+        ("STORAGE_HOST", "127.231.19.9", "host", "127.231.19.9"),
+        ("STORAGE_PORT", "8080", "port", 8080),
+        ("STORAGE_BASE_PATH", "/tmp/foo", "base_path", Path("/tmp/foo")),
+    ],
+)
+def test_setting_override(monkeypatch, env, value, field, expected):
+    monkeypatch.setenv(env, value)
+    assert getattr(config.load_settings(), field) == expected
 
 
 def test_client_limits_positive():
@@ -35,13 +38,11 @@ def test_client_limits_positive():
     assert config.CLIENT_MAX_KEEPALIVE_CONNECTIONS > 0
 
 
-def test_base_path_default(monkeypatch):
-    monkeypatch.delenv("STORAGE_BASE_PATH", raising=False)
-    importlib.reload(config)
-    assert config.BASE_PATH == Path("data")
-
-
-def test_base_path_override(monkeypatch):
-    monkeypatch.setenv("STORAGE_BASE_PATH", "/tmp/foo")
-    importlib.reload(config)
-    assert config.BASE_PATH == Path("/tmp/foo")
+def test_settings_parsed_once(monkeypatch):
+    config.settings.cache_clear()
+    first = config.settings()
+    monkeypatch.setenv("STORAGE_PORT", "9090")
+    assert config.settings() is first
+    config.settings.cache_clear()
+    assert config.settings().port == 9090
+    config.settings.cache_clear()
@@ -0,0 +1,110 @@
+import errno
+import os
+
+import pytest
+
+from docai.storage import direct_io
+from docai.storage.direct_io import (
+    ALIGNMENT,
+    AlignedBufferPool,
+    copy_direct,
+    write_buffered,
+    write_direct,
+)
+
+
+@pytest.mark.parametrize("size", [0, 1, ALIGNMENT - 1, ALIGNMENT, 3 * ALIGNMENT + 17])
+def test_write_direct_roundtrip(tmp_path, size):
+    content = os.urandom(size)
+    path = tmp_path / "out.bin"
+    write_direct(str(path), content)
+    assert path.read_bytes() == content
+
+
+def test_write_direct_truncates_existing(tmp_path):
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"x" * (2 * ALIGNMENT))
+    write_direct(str(path), b"short")
+    assert path.read_bytes() == b"short"
+
+
+def test_write_direct_falls_back_on_einval(tmp_path, monkeypatch):
+    real_open = os.open
+
+    def reject_o_direct(path, flags, *args, **kwargs):
+        if flags & getattr(os, "O_DIRECT", 0):
+            raise OSError(errno.EINVAL, "Invalid argument")
+        return real_open(path, flags, *args, **kwargs)
+
+    monkeypatch.setattr(direct_io.os, "open", reject_o_direct)
+    path = tmp_path / "out.bin"
+    write_direct(str(path), b"PDF")
+    assert path.read_bytes() == b"PDF"
+
+
+def test_write_buffered_handles_short_writes(tmp_path, monkeypatch):
+    real_write = os.write
+    monkeypatch.setattr(
+        direct_io.os, "write", lambda fd, data: real_write(fd, data[:3])
+    )
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"previous, longer content")
+    write_buffered(str(path), b"0123456789")
+    assert path.read_bytes() == b"0123456789"
+
+
+def test_buffer_pool_reuses_by_size_class():
+    pool = AlignedBufferPool(max_buffer=4 * ALIGNMENT, per_class=1)
+    buf = pool.acquire(ALIGNMENT + 1)
+    assert len(buf) == 2 * ALIGNMENT
+    pool.release(buf)
+    assert pool.acquire(2 * ALIGNMENT) is buf
+
+    big = pool.acquire(5 * ALIGNMENT)
+    assert len(big) == 5 * ALIGNMENT
+    pool.release(big)
+    assert big.closed
+
+
+def test_write_direct_zero_pads_reused_buffers(tmp_path, monkeypatch):
+    written = []
+    real_write_all = direct_io.write_all
+
+    def recording_write_all(fd, data):
+        written.append(bytes(data))
+        real_write_all(fd, data)
+
+    monkeypatch.setattr(direct_io, "_pool", AlignedBufferPool())
+    monkeypatch.setattr(direct_io, "write_all", recording_write_all)
+    write_direct(str(tmp_path / "a.bin"), b"SECRET-DOC-A" * 300)
+    write_direct(str(tmp_path / "b.bin"), b"B")
+
+    # whether or not the filesystem took O_DIRECT, nothing past the content
+    # may carry bytes from the previous file
+    assert written[-1].rstrip(b"\0") == b"B"
+    assert (tmp_path / "b.bin").read_bytes() == b"B"
+
+
+@pytest.mark.parametrize(
+    "sizes", [[], [1], [ALIGNMENT, 5], [3000] * 7, [direct_io.COPY_BUFFER + 1, 9]]
+)
+def test_copy_direct_roundtrip(tmp_path, sizes):
+    chunks = [os.urandom(n) for n in sizes]
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"x" * (3 * ALIGNMENT))
+    copy_direct(str(path), iter(chunks))
+    assert path.read_bytes() == b"".join(chunks)
+
+
+def test_copy_direct_falls_back_on_einval(tmp_path, monkeypatch):
+    real_open = os.open
+
+    def reject_o_direct(path, flags, *args, **kwargs):
+        if flags & getattr(os, "O_DIRECT", 0):
+            raise OSError(errno.EINVAL, "Invalid argument")
+        return real_open(path, flags, *args, **kwargs)
+
+    monkeypatch.setattr(direct_io.os, "open", reject_o_direct)
+    path = tmp_path / "out.bin"
+    copy_direct(str(path), iter([b"P", b"DF"]))
+    assert path.read_bytes() == b"PDF"
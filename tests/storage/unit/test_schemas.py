@@ -7,101 +7,163 @@ from docai.storage.schemas import (
     SavePDFResponse,
     SaveImageData,
     SaveImageResponse,
+    SaveImagesData,
+    SaveImagesResponse,
     DeleteDocumentData,
     DeleteDocumentResponse,
 )
 from docai.shared.models.dto.meta import Meta
 
-
-# ––– SavePDFData –––
-def test_savepdfdata_valid():
-    obj = SavePDFData(
-        doc_id="doc_123456789",
-        pdf_path="data/pdfs/doc_123456789.pdf",
-    )
-    assert obj.doc_id.startswith("doc_")
-    assert obj.pdf_path.endswith(".pdf")
-
-
-def test_savepdfdata_invalid():
-    with pytest.raises(ValidationError):
+_META = Meta(timestamp=datetime.now(timezone.utc), version="1.0.0")
+_PDF_DATA = SavePDFData(doc_id="doc_123", pdf_path="some/path.pdf")
+_IMAGE_DATA = SaveImageData(doc_id="doc_img2", page_number=2, image_path="img2.jpg")
+_IMAGES_DATA = SaveImagesData(doc_id="doc_img2", images=[_IMAGE_DATA])
+_DELETE_DATA = DeleteDocumentData(doc_id="doc_del2", detail="OK")
+
+
+# ––– Validation, one row per (model, input) –––
+@pytest.mark.parametrize(
+    "model,kwargs,ok",
+    [
+        pytest.param(
+            SavePDFData,
+            {"doc_id": "doc_123456789", "pdf_path": "data/pdfs/doc_123456789.pdf"},
+            True,
+            id="savepdfdata_valid",
+        ),
         # wrong types for both fields
-        SavePDFData(doc_id=123, pdf_path=456)
-
-
-# ––– SavePDFResponse –––
-def test_savepdfresponse_valid():
-    data = SavePDFData(
-        doc_id="doc_123",
-        pdf_path="some/path.pdf",
-    )
-    meta = Meta(timestamp=datetime.now(timezone.utc), version="1.0.0")
-    resp = SavePDFResponse(data=data, meta=meta)
-    assert resp.data == data
-    assert resp.meta.version == "1.0.0"
-
-
-def test_savepdfresponse_invalid():
-    with pytest.raises(ValidationError):
-        # missing both .data and .meta or wrong types
-        SavePDFResponse(data={}, meta=None)
-
-
-# ––– SaveImageData –––
-def test_saveimagedata_valid():
-    obj = SaveImageData(
-        doc_id="doc_img",
-        page_number=0,
-        image_path="data/images/doc_img_p0.jpg",
-    )
-    assert obj.page_number == 0
-    assert obj.image_path.endswith(".jpg")
-
-
-def test_saveimagedata_invalid():
-    with pytest.raises(ValidationError):
+        pytest.param(
+            SavePDFData,
+            {"doc_id": 123, "pdf_path": 456},
+            False,
+            id="savepdfdata_invalid",
+        ),
+        pytest.param(
+            SaveImageData,
+            {
+                "doc_id": "doc_img",
+                "page_number": 0,
+                "image_path": "data/images/doc_img_p0.jpg",
+            },
+            True,
+            id="saveimagedata_valid",
+        ),
         # None doc_id, negative page_number, wrong image_path type
-        SaveImageData(doc_id=None, page_number=-1, image_path=123)
-
-
-# ––– SaveImageResponse –––
-def test_saveimageresponse_valid():
-    data = SaveImageData(
-        doc_id="doc_img2",
-        page_number=2,
-        image_path="img2.jpg",
-    )
-    meta = Meta(timestamp=datetime.now(timezone.utc), version="2.0")
-    resp = SaveImageResponse(data=data, meta=meta)
-    assert resp.data.doc_id == "doc_img2"
+        pytest.param(
+            SaveImageData,
+            {"doc_id": None, "page_number": -1, "image_path": 123},
+            False,
+            id="saveimagedata_invalid",
+        ),
+        pytest.param(
+            SaveImagesData,
+            {"doc_id": "doc_img2", "images": [_IMAGE_DATA]},
+            True,
+            id="saveimagesdata_valid",
+        ),
+        # images must be a list of valid SaveImageData entries
+        pytest.param(
+            SaveImagesData,
+            {"doc_id": "doc_img2", "images": [{"doc_id": "doc_img2"}]},
+            False,
+            id="saveimagesdata_invalid",
+        ),
+        pytest.param(
+            DeleteDocumentData,
+            {"doc_id": "doc_del", "detail": "Document deleted successfully."},
+            True,
+            id="deletedocumentdata_valid",
+        ),
+        # doc_id wrong type, missing detail
+        pytest.param(
+            DeleteDocumentData,
+            {"doc_id": 123},
+            False,
+            id="deletedocumentdata_invalid",
+        ),
+    ],
+)
+def test_data_models(model, kwargs, ok):
+    if not ok:
+        with pytest.raises(ValidationError):
+            model(**kwargs)
+        return
+    obj = model(**kwargs)
+    assert all(getattr(obj, k) == v for k, v in kwargs.items())
+
+
+@pytest.mark.parametrize(
+    "model,kwargs,ok",
+    [
+        pytest.param(
+            SavePDFResponse,
+            {"data": _PDF_DATA, "meta": _META},
+            True,
+            id="savepdfresponse_valid",
+        ),
+        # missing both .data and .meta or wrong types
+        pytest.param(
+            SavePDFResponse,
+            {"data": {}, "meta": None},
+            False,
+            id="savepdfresponse_invalid",
+        ),
+        pytest.param(
+            SaveImageResponse,
+            {"data": _IMAGE_DATA, "meta": _META},
+            True,
+            id="saveimageresponse_valid",
+        ),
+        pytest.param(
+            SaveImageResponse,
+            {"data": {}, "meta": {}},
+            False,
+            id="saveimageresponse_invalid",
+        ),
+        pytest.param(
+            SaveImagesResponse,
+            {"data": _IMAGES_DATA, "meta": _META},
+            True,
+            id="saveimagesresponse_valid",
+        ),
+        pytest.param(
+            SaveImagesResponse,
+            {"data": _IMAGE_DATA, "meta": _META},
+            False,
+            id="saveimagesresponse_invalid",
+        ),
+        pytest.param(
+            DeleteDocumentResponse,
+            {"data": _DELETE_DATA, "meta": _META},
+            True,
+            id="deletedocumentresponse_valid",
+        ),
+        pytest.param(
+            DeleteDocumentResponse,
+            {"data": None, "meta": None},
+            False,
+            id="deletedocumentresponse_invalid",
+        ),
+    ],
+)
+def test_response_models(model, kwargs, ok):
+    if not ok:
+        with pytest.raises(ValidationError):
+            model(**kwargs)
+        return
+    resp = model(**kwargs)
+    assert resp.data == kwargs["data"]
+    assert resp.meta.version == "1.0.0"
     assert resp.meta.timestamp <= datetime.now(timezone.utc)
 
 
-def test_saveimageresponse_invalid():
+# ––– Model configuration –––
+def test_models_are_frozen():
+    obj = SavePDFData(doc_id="doc_1", pdf_path="p.pdf")
     with pytest.raises(ValidationError):
-        SaveImageResponse(data={}, meta={})
-
-
-# ––– DeleteDocumentData –––
-def test_deletedocumentdata_valid():
-    obj = DeleteDocumentData(doc_id="doc_del", detail="Document deleted successfully.")
-    assert "deleted" in obj.detail.lower()
-
-
-def test_deletedocumentdata_invalid():
-    with pytest.raises(ValidationError):
-        # doc_id wrong type, missing detail
-        DeleteDocumentData(doc_id=123)
-
-
-# ––– DeleteDocumentResponse –––
-def test_deletedocumentresponse_valid():
-    data = DeleteDocumentData(doc_id="doc_del2", detail="OK")
-    meta = Meta(timestamp=datetime.now(timezone.utc), version="v1")
-    resp = DeleteDocumentResponse(data=data, meta=meta)
-    assert resp.data.doc_id == "doc_del2"
+        obj.doc_id = "doc_2"
 
 
-def test_deletedocumentresponse_invalid():
+def test_models_forbid_extra_fields():
     with pytest.raises(ValidationError):
-        DeleteDocumentResponse(data=None, meta=None)
+        DeleteDocumentData(doc_id="doc_1", detail="OK", extra="nope")
@@ -1,13 +1,21 @@
 # tests/unit/test_storage_service.py
+import asyncio
+import io
+import os
+import shutil
+import sys
+import threading
 import pytest
 from pathlib import Path
+import docai.storage.storage as storage_mod
 from docai.storage.storage import StorageService
 from docai.storage.exceptions import (
-    SavePDFError,
+    FileTooLargeError,
     SaveImageError,
     PDFNotFoundError,
     ImageNotFoundError,
     DeleteDocumentError,
+    InvalidDocumentIdError,
 )
 
 
@@ -27,6 +35,18 @@ async def test_save_and_get_pdf(svc):
     assert path2 == path
 
 
+@pytest.mark.asyncio
+async def test_save_pdf_too_large_leaves_no_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_mod, "COPY_CHUNK_SIZE", 3)
+    svc = StorageService(base_path=tmp_path, max_upload_bytes=4)
+    with pytest.raises(FileTooLargeError):
+        await svc.save_pdf("d11", io.BytesIO(b"PDFCONTENT"))
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path("d11")
+    # the partially written temporary file is cleaned up
+    assert list(svc.pdf_dir.iterdir()) == []
+
+
 @pytest.mark.asyncio
 async def test_get_pdf_not_found(svc):
     with pytest.raises(PDFNotFoundError):
@@ -42,6 +62,37 @@ async def test_save_and_get_image(svc):
     assert p2 == path
 
 
+@pytest.mark.asyncio
+async def test_save_images_batch(svc):
+    paths = await svc.save_images("d4", [(0, b"I0"), (1, b"I1"), (2, b"I2")])
+    assert [p.name for p in paths] == ["d4_p0.jpg", "d4_p1.jpg", "d4_p2.jpg"]
+    for page, path in enumerate(paths):
+        assert path.read_bytes() == f"I{page}".encode()
+        assert await svc.get_image_path("d4", page) == path
+
+
+@pytest.mark.asyncio
+async def test_save_images_failure_raises(svc):
+    svc.image_dir.rmdir()
+    with pytest.raises(SaveImageError):
+        await svc.save_images("d5", [(0, b"I0")])
+
+
+@pytest.mark.asyncio
+async def test_save_images_cancelled_page_is_not_wrapped(svc, monkeypatch):
+    real_write_atomic = svc._write_atomic
+
+    async def cancel_page_1(file_path, *args):
+        if file_path.endswith("_p1.jpg"):
+            raise asyncio.CancelledError()
+        return await real_write_atomic(file_path, *args)
+
+    monkeypatch.setattr(svc, "_write_atomic", cancel_page_1)
+    with pytest.raises(asyncio.CancelledError):
+        await svc.save_images("d24", [(0, b"I0"), (1, b"I1")])
+    assert not (svc.image_dir / "d24_p0.jpg").exists()
+
+
 @pytest.mark.asyncio
 async def test_get_image_not_found(svc):
     with pytest.raises(ImageNotFoundError):
@@ -64,7 +115,381 @@ async def test_delete_document(svc):
         await svc.get_image_path("d3", 1)
 
 
+@pytest.mark.asyncio
+async def test_delete_document_keeps_other_documents(svc):
+    await svc.save_image("d3", 0, b"I0")
+    await svc.save_image("d30", 0, b"J0")
+    await svc.delete_document("d3")
+    assert await svc.get_image_path("d30", 0)
+
+
 @pytest.mark.asyncio
 async def test_delete_nonexistent_is_noop(svc):
     # Should not raise
     await svc.delete_document("doesnotexist")
+
+
+@pytest.mark.asyncio
+async def test_save_leaves_no_temp_files(svc):
+    await svc.save_pdf("d6", b"P1")
+    await svc.save_pdf("d6", b"P2")
+    assert [p.name for p in svc.pdf_dir.iterdir()] == ["d6.pdf"]
+    assert (svc.pdf_dir / "d6.pdf").read_bytes() == b"P2"
+
+
+def test_get_lock_is_shared_per_doc_and_released(svc):
+    lock = svc._get_lock("d7")
+    assert svc._get_lock("d7") is lock
+    assert svc._get_lock("d8") is not lock
+    del lock
+    assert "d7" not in svc._locks
+
+
+@pytest.mark.asyncio
+async def test_save_with_o_direct(tmp_path):
+    svc = StorageService(base_path=tmp_path, use_o_direct=True)
+    pdf = await svc.save_pdf("d9", b"P" * 5000)
+    img = await svc.save_image("d9", 0, b"I")
+    assert pdf.read_bytes() == b"P" * 5000
+    assert img.read_bytes() == b"I"
+
+
+@pytest.mark.asyncio
+async def test_save_fileobj_with_o_direct(tmp_path, monkeypatch):
+    copies = []
+    real_copy_direct = storage_mod.copy_direct
+
+    def recording_copy_direct(*args):
+        copies.append(args[0])
+        real_copy_direct(*args)
+
+    monkeypatch.setattr(storage_mod, "copy_direct", recording_copy_direct)
+    svc = StorageService(base_path=tmp_path, use_o_direct=True)
+    pdf = await svc.save_pdf("d9", io.BytesIO(b"P" * 5000))
+    assert pdf.read_bytes() == b"P" * 5000
+    assert len(copies) == 1
+
+
+@pytest.mark.asyncio
+async def test_exists_cache_skips_stat_and_is_invalidated(tmp_path, monkeypatch):
+    svc = StorageService(base_path=tmp_path, exists_cache_ttl=30)
+    path = await svc.save_pdf("d12", b"P")
+
+    def fail_stat(p, *args, **kwargs):
+        raise AssertionError("cached existence check must not stat")
+
+    monkeypatch.setattr(storage_mod.os, "stat", fail_stat)
+    found = await svc.get_pdf_path("d12")
+    monkeypatch.undo()
+    assert found == path
+
+    await svc.delete_document("d12")
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path("d12")
+
+
+@pytest.mark.asyncio
+async def test_save_racing_delete_does_not_cache_deleted_file(svc, monkeypatch):
+    renamed, release = threading.Event(), threading.Event()
+    real_write_bytes = svc._write_bytes
+
+    def write_then_wait(*args):
+        st = real_write_bytes(*args)
+        renamed.set()
+        release.wait(5)
+        return st
+
+    monkeypatch.setattr(svc, "_write_bytes", write_then_wait)
+    save = asyncio.create_task(svc.save_pdf("d19", b"P"))
+    # the file is in place but the save has not cached it yet
+    await asyncio.to_thread(renamed.wait, 5)
+    await svc.delete_document("d19")
+    release.set()
+    await save
+
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path("d19")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_save_leaves_temp_cleanup_to_its_worker(svc, monkeypatch):
+    started, release, cleaned = threading.Event(), threading.Event(), threading.Event()
+    real_unlink = svc._unlink
+
+    def blocked_replace(tmp_path, file_path):
+        started.set()
+        release.wait(5)
+        raise OSError("rename failed")
+
+    def recording_unlink(file_path):
+        error = real_unlink(file_path)
+        cleaned.set()
+        return error
+
+    monkeypatch.setattr(svc, "_replace", blocked_replace)
+    monkeypatch.setattr(svc, "_unlink", recording_unlink)
+    save = asyncio.create_task(svc.save_pdf("d23", b"P"))
+    await asyncio.to_thread(started.wait, 5)
+    save.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await save
+    # the worker thread still owns the temporary file...
+    assert any(".tmp." in p.name for p in svc.pdf_dir.iterdir())
+    release.set()
+    # ...and removes it once its own rename fails
+    assert await asyncio.to_thread(cleaned.wait, 5)
+    assert list(svc.pdf_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_sharded_layout(tmp_path, monkeypatch):
+    svc = StorageService(base_path=tmp_path, shard_prefix_len=2)
+    pdf = await svc.save_pdf("abc1", b"P")
+    img = await svc.save_image("abc1", 0, b"I")
+    assert pdf == tmp_path / "pdfs" / "ab" / "abc1.pdf"
+    assert img == tmp_path / "images" / "ab" / "abc1_p0.jpg"
+    assert await svc.get_pdf_path("abc1") == pdf
+    assert await svc.get_image_path("abc1", 0) == img
+
+    # this service creates each shard directory only once
+    calls = []
+    real_makedirs = storage_mod.os.makedirs
+    monkeypatch.setattr(
+        storage_mod.os,
+        "makedirs",
+        lambda d, **kw: calls.append(d) or real_makedirs(d, **kw),
+    )
+    await svc.save_pdf("abc2", b"P")
+    await svc.save_pdf("xyz1", b"P")
+    assert calls == [str(tmp_path / "pdfs" / "xy")]
+
+    await svc.delete_document("abc1")
+    assert not pdf.exists() and not img.exists()
+
+
+@pytest.mark.asyncio
+async def test_delete_only_matches_own_page_images(tmp_path):
+    svc = StorageService(base_path=tmp_path)
+    await svc.save_image("doc", 0, b"A")
+    await svc.save_image("doc", 12, b"B")
+    await svc.save_image("doc_pX", 1, b"C")
+    await svc.delete_document("doc")
+    remaining = sorted(p.name for p in (tmp_path / "images").iterdir())
+    assert remaining == ["doc_pX_p1.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_delete_reports_image_unlink_failures(svc, monkeypatch):
+    await svc.save_image("d13", 0, b"A")
+    await svc.save_image("d13", 1, b"B")
+
+    real_unlink = os.unlink
+
+    def flaky_unlink(path, *args, **kwargs):
+        if path.endswith("_p1.jpg"):
+            raise PermissionError(path)
+        real_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(storage_mod.os, "unlink", flaky_unlink)
+    with pytest.raises(DeleteDocumentError, match="1 image"):
+        await svc.delete_document("d13")
+    assert not (svc.image_dir / "d13_p0.jpg").exists()
+    assert (svc.image_dir / "d13_p1.jpg").exists()
+
+
+@pytest.mark.asyncio
+async def test_dir_fds_resolve_relative_names_and_close(tmp_path, monkeypatch):
+    svc = StorageService(base_path=tmp_path)
+    if sys.platform.startswith("linux"):
+        assert svc._pdf_dir_fd is not None and svc._image_dir_fd is not None
+    elif svc._pdf_dir_fd is None:
+        pytest.skip("dir_fd operations not supported on this platform")
+
+    seen = []
+
+    def recording(name):
+        real = getattr(os, name)
+
+        def record(path, *args, **kwargs):
+            seen.append((name, path, kwargs.get("dir_fd")))
+            return real(path, *args, **kwargs)
+
+        monkeypatch.setattr(storage_mod.os, name, record)
+
+    await svc.save_pdf("d14", b"P")
+    svc._exists_cache.pop(str(svc.pdf_dir / "d14.pdf"))
+    recording("stat")
+    await svc.get_pdf_path("d14")
+    assert seen == [("stat", "d14.pdf", svc._pdf_dir_fd)]
+
+    seen.clear()
+    recording("open")
+    recording("unlink")
+    await svc.save_pdf("d15", io.BytesIO(b"S"))
+    await svc.delete_document("d15")
+    monkeypatch.undo()
+    assert {name for name, _, _ in seen} == {"open", "stat", "unlink"}
+    # only the storage roots themselves are statted by path, to spot
+    # replaced directories
+    roots = {str(svc.pdf_dir), str(svc.image_dir)}
+    assert all(
+        not os.path.isabs(path) or (name == "stat" and fd is None and path in roots)
+        for name, path, fd in seen
+    )
+    assert ("unlink", "d15.pdf", svc._pdf_dir_fd) in seen
+
+    svc.close()
+    assert svc._pdf_dir_fd is None and svc._image_dir_fd is None
+    assert (await svc.save_image("d14", 0, b"I")).read_bytes() == b"I"
+    await svc.delete_document("d14")
+    assert not any(tmp_path.rglob("d14*"))
+
+
+@pytest.mark.asyncio
+async def test_replaced_storage_directories_are_reopened(tmp_path):
+    svc = StorageService(base_path=tmp_path, exists_cache_ttl=0)
+    await svc.save_pdf("d22", b"P")
+    shutil.rmtree(svc.pdf_dir)
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path("d22")
+
+    path = await svc.save_pdf("d22", b"Q")
+    assert path.read_bytes() == b"Q"
+    assert await svc.get_pdf_path("d22") == path
+
+    shutil.rmtree(svc.image_dir)
+    svc.image_dir.mkdir()
+    (svc.image_dir / "d22_p0.jpg").write_bytes(b"I")
+    assert await svc.get_image_path("d22", 0)
+    await svc.delete_document("d22")
+    assert not any(svc.base_path.rglob("d22*"))
+
+
+def test_at_refuses_names_that_escape_the_root(svc):
+    if svc._pdf_dir_fd is None:
+        pytest.skip("dir_fd operations not supported on this platform")
+    with pytest.raises(InvalidDocumentIdError):
+        svc._at(f"{svc._pdf_prefix}{os.sep}.pdf")
+    with pytest.raises(InvalidDocumentIdError):
+        svc._at(svc._image_prefix)
+
+
+def test_new_service_recreates_removed_base_directory(tmp_path):
+    base = tmp_path / "fresh"
+    StorageService(base_path=base).close()
+    shutil.rmtree(base)
+    svc = StorageService(base_path=base)
+    assert svc.pdf_dir.is_dir() and svc.image_dir.is_dir()
+
+
+@pytest.mark.asyncio
+async def test_save_pdf_from_file_object(svc, monkeypatch):
+    monkeypatch.setattr(storage_mod, "COPY_CHUNK_SIZE", 3)
+    path = await svc.save_pdf("d15", io.BytesIO(b"%PDF-1.7"))
+    assert path.read_bytes() == b"%PDF-1.7"
+
+    svc._max_upload_bytes = 4
+    with pytest.raises(FileTooLargeError):
+        await svc.save_pdf("d16", io.BytesIO(b"%PDF-1.7"))
+    assert not (svc.pdf_dir / "d16.pdf").exists()
+    assert list(svc.pdf_dir.iterdir()) == [path]
+
+
+@pytest.mark.asyncio
+async def test_save_images_from_file_objects(svc):
+    img = await svc.save_image("d20", 0, io.BytesIO(b"I0"))
+    paths = await svc.save_images("d20", [(1, io.BytesIO(b"I1")), (2, b"I2")])
+    assert img.read_bytes() == b"I0"
+    assert [p.read_bytes() for p in paths] == [b"I1", b"I2"]
+
+    svc._max_upload_bytes = 4
+    with pytest.raises(FileTooLargeError):
+        await svc.save_image("d21", 0, io.BytesIO(b"JPEGDATA"))
+    with pytest.raises(FileTooLargeError):
+        await svc.save_images(
+            "d21", [(0, io.BytesIO(b"I")), (1, io.BytesIO(b"JPEGDATA"))]
+        )
+    # the page that did fit is rolled back with the rest of the batch
+    assert not any(p.name.startswith("d21") for p in svc.image_dir.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_delete_many_images_in_parallel(svc, monkeypatch):
+    monkeypatch.setattr(storage_mod, "PARALLEL_UNLINK_THRESHOLD", 4)
+    await svc.save_images("d17", [(page, b"I") for page in range(6)])
+    await svc.save_image("d18", 0, b"J")
+
+    # Unlinks pair up at a barrier: run one after another, the first would
+    # time out waiting for a peer and break the delete.
+    barrier = threading.Barrier(2, timeout=5)
+    threads = []
+    real_unlink = svc._unlink
+
+    def paired_unlink(file_path):
+        threads.append(threading.current_thread().name)
+        barrier.wait()
+        return real_unlink(file_path)
+
+    monkeypatch.setattr(svc, "_unlink", paired_unlink)
+    await svc.delete_document("d17")
+    assert [p.name for p in svc.image_dir.iterdir()] == ["d18_p0.jpg"]
+    # the PDF unlink is skipped (no PDF saved), so every call is an image
+    assert len(threads) == 6
+    assert all(name.startswith("storage-unlink") for name in threads)
+    assert len(set(threads)) >= 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "doc_id, shard_prefix_len",
+    [
+        ("../../escape/deep/x", 1),
+        ("a/b", 1),
+        ("..", 1),
+        (".x", 1),
+        ("", 1),
+        ("", 0),
+        ("a", 2),
+        ("a\0b", 1),
+    ],
+)
+async def test_unsafe_doc_ids_are_rejected(tmp_path, doc_id, shard_prefix_len):
+    root = tmp_path / "root"
+    svc = StorageService(base_path=root / "base", shard_prefix_len=shard_prefix_len)
+    with pytest.raises(InvalidDocumentIdError):
+        await svc.save_pdf(doc_id, b"hi")
+    with pytest.raises(InvalidDocumentIdError):
+        await svc.save_image(doc_id, 0, b"hi")
+    with pytest.raises(InvalidDocumentIdError):
+        await svc.save_images(doc_id, [(0, b"hi")])
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path(doc_id)
+    with pytest.raises(ImageNotFoundError):
+        await svc.get_image_path(doc_id, 0)
+    with pytest.raises(InvalidDocumentIdError):
+        await svc.delete_document(doc_id)
+    assert [p.name for p in root.iterdir()] == ["base"]
+    assert not any(p.is_file() for p in root.rglob("*"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shard_prefix_len", [0, 2])
+async def test_doc_ids_with_inner_dots_are_saved(tmp_path, shard_prefix_len):
+    svc = StorageService(base_path=tmp_path, shard_prefix_len=shard_prefix_len)
+    pdf = await svc.save_pdf("x..y", b"P")
+    img = await svc.save_image("x..y", 0, b"I")
+    assert pdf.name == "x..y.pdf"
+    assert pdf.resolve().is_relative_to((tmp_path / "pdfs").resolve())
+    assert await svc.get_pdf_path("x..y") == pdf
+    assert await svc.get_image_path("x..y", 0) == img
+    await svc.delete_document("x..y")
+    assert not pdf.exists() and not img.exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("doc_id", ["x" * 300, "nul\0byte"])
+async def test_unstatable_doc_ids_are_not_found(svc, doc_id):
+    with pytest.raises(PDFNotFoundError):
+        await svc.get_pdf_path(doc_id)
+    with pytest.raises(ImageNotFoundError):
+        await svc.get_image_path(doc_id, 0)
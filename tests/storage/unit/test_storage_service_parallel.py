@@ -1,51 +1,84 @@
-import time
 import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Set
+
 import pytest
 import aiofiles
 import aiofiles.os
 
 from pathlib import Path
+import docai.storage.storage as storage_mod
 from docai.storage.storage import StorageService
 
+# Upper bound on how long a gated op waits for its peers; only hit on failure.
+GATE_TIMEOUT = 5.0
+
+
+@dataclass
+class ThreadGate:
+    """Releases ops running in worker threads once `expected` have started."""
+
+    expected: int
+    started: Set[str] = field(default_factory=set)
+    released: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def arrive(self, op_id: str) -> None:
+        with self._lock:
+            self.started.add(op_id)
+            if len(self.started) >= self.expected:
+                self.released.set()
+        if not self.released.wait(GATE_TIMEOUT):
+            raise AssertionError(f"ops ran serially: only {self.started} started")
+
+    def is_set(self) -> bool:
+        return self.released.is_set()
+
 
 @pytest.fixture
-def svc(tmp_path, monkeypatch):
-    service = StorageService(base_path=tmp_path / "data")
+def write_gate():
+    return ThreadGate(expected=2)
 
-    # 1) Each doc_id uses its own lock (no contention)
-    monkeypatch.setattr(service, "_get_lock", lambda doc_id: asyncio.Lock())
 
-    # 2) Fake aiofiles.open → returns an async-context-manager with a 0.1s write delay
-    def fake_open(path, mode):
-        class FakeFile:
-            async def write(self, data):
-                await asyncio.sleep(0.1)
+@pytest.fixture
+def remove_gate():
+    return ThreadGate(expected=2)
 
-            async def __aenter__(self):
-                return self
 
-            async def __aexit__(self, exc_type, exc, tb):
-                pass
+@pytest.fixture
+def svc(tmp_path, monkeypatch, write_gate, remove_gate):
+    service = StorageService(base_path=tmp_path / "data")
+
+    # 1) One lock per doc_id, shared by every call for that doc_id
+    locks = {}
+
+    def get_lock(doc_id):
+        lock = locks.get(doc_id)
+        if lock is None:
+            lock = locks[doc_id] = asyncio.Lock()
+        return lock
 
-        return FakeFile()
+    monkeypatch.setattr(service, "_get_lock", get_lock)
 
-    monkeypatch.setattr(aiofiles, "open", fake_open)
+    # 2) In-memory saves run in a worker thread; each write blocks until its
+    #    peer has started too, so serialized saves fail instead of passing slowly
+    real_write = storage_mod.write_buffered
 
-    # 3) Fake exists/remove/listdir to each cost 0.1s
-    async def fake_exists(path_str):
-        await asyncio.sleep(0.1)
-        return True
+    def gated_write(path, *args):
+        write_gate.arrive(path)
+        real_write(path, *args)
 
-    async def fake_remove(path_str):
-        await asyncio.sleep(0.1)
+    monkeypatch.setattr(storage_mod, "write_buffered", gated_write)
 
-    async def fake_listdir(dir_str):
-        await asyncio.sleep(0.1)
-        return []
+    # 3) Unlinks also run in a worker thread and are gated the same way
+    real_unlink = service._unlink
 
-    monkeypatch.setattr(aiofiles.os.path, "exists", fake_exists)
-    monkeypatch.setattr(aiofiles.os, "remove", fake_remove)
-    monkeypatch.setattr(aiofiles.os, "listdir", fake_listdir)
+    def gated_unlink(file_path):
+        remove_gate.arrive(file_path)
+        return real_unlink(file_path)
+
+    monkeypatch.setattr(service, "_unlink", gated_unlink)
 
     return service
 
@@ -54,99 +87,98 @@ def svc(tmp_path, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_save_pdf_parallelism(svc):
-    start = time.monotonic()
-    await asyncio.gather(
-        svc.save_pdf("docA", b"X"),
-        svc.save_pdf("docB", b"Y"),
-    )
-    elapsed = time.monotonic() - start
-    assert 0.09 < elapsed < 0.15, f"PDF save not parallel: {elapsed:.3f}s"
+async def test_save_pdf_parallelism(svc, write_gate):
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(svc.save_pdf("docA", b"X")),
+            tg.create_task(svc.save_pdf("docB", b"Y")),
+        ]
+    assert all(isinstance(t.result(), Path) for t in tasks)
+    assert write_gate.is_set(), "PDF save not parallel"
 
 
 @pytest.mark.asyncio
-async def test_save_image_parallelism(svc):
-    start = time.monotonic()
-    await asyncio.gather(
-        svc.save_image("imgA", 0, b"X"),
-        svc.save_image("imgB", 1, b"Y"),
-    )
-    elapsed = time.monotonic() - start
-    assert 0.09 < elapsed < 0.15, f"Image save not parallel: {elapsed:.3f}s"
+async def test_save_image_parallelism(svc, write_gate):
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(svc.save_image("imgA", 0, b"X")),
+            tg.create_task(svc.save_image("imgB", 1, b"Y")),
+        ]
+    assert all(isinstance(t.result(), Path) for t in tasks)
+    assert write_gate.is_set(), "Image save not parallel"
 
 
 @pytest.mark.asyncio
-async def test_mixed_save_parallelism(svc):
-    start = time.monotonic()
-    await asyncio.gather(
-        svc.save_pdf("mixed", b"P"),
-        svc.save_image("mixed", 2, b"I"),
-    )
-    elapsed = time.monotonic() - start
-    assert 0.09 < elapsed < 0.15, f"Mixed save not parallel: {elapsed:.3f}s"
+async def test_mixed_save_parallelism(svc, write_gate):
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(svc.save_pdf("mixed", b"P")),
+            tg.create_task(svc.save_image("mixed", 2, b"I")),
+        ]
+    assert all(isinstance(t.result(), Path) for t in tasks)
+    assert write_gate.is_set(), "Mixed save not parallel"
 
 
-# ── GET parallelism ──────────────────────────────────────────────────────────
+# ── GET existence checks ─────────────────────────────────────────────────────
 
 
 @pytest.mark.asyncio
-async def test_get_pdf_parallelism(svc):
-    start = time.monotonic()
-    await asyncio.gather(
-        svc.get_pdf_path("docA"),
-        svc.get_pdf_path("docB"),
-    )
-    elapsed = time.monotonic() - start
-    assert 0.09 < elapsed < 0.15, f"PDF get not parallel: {elapsed:.3f}s"
+async def test_get_paths_do_not_dispatch(svc, monkeypatch):
+    async def fail_exists(path_str):
+        raise AssertionError("existence check must not go through aiofiles")
 
+    monkeypatch.setattr(aiofiles.os.path, "exists", fail_exists)
+    for doc in ("docA", "docB"):
+        pdfp = svc.pdf_dir / f"{doc}.pdf"
+        pdfp.write_bytes(b"x")
+    (svc.image_dir / "imgA_p0.jpg").write_bytes(b"x")
 
-@pytest.mark.asyncio
-async def test_get_image_parallelism(svc):
-    start = time.monotonic()
-    await asyncio.gather(
+    results = await asyncio.gather(
+        svc.get_pdf_path("docA"),
+        svc.get_pdf_path("docB"),
         svc.get_image_path("imgA", 0),
-        svc.get_image_path("imgB", 1),
     )
-    elapsed = time.monotonic() - start
-    assert 0.09 < elapsed < 0.15, f"Image get not parallel: {elapsed:.3f}s"
+    assert all(isinstance(r, Path) for r in results)
 
 
 # ── DELETE parallelism ───────────────────────────────────────────────────────
 
 
 @pytest.mark.asyncio
-async def test_delete_document_parallelism(svc, tmp_path):
+async def test_delete_document_parallelism(svc, remove_gate, tmp_path):
     # Prepare two PDFs under distinct doc_ids
     for doc in ("docA", "docB"):
         pdfp = tmp_path / "data" / "pdfs" / f"{doc}.pdf"
         pdfp.parent.mkdir(parents=True, exist_ok=True)
         pdfp.write_bytes(b"x")
 
-    start = time.monotonic()
-    # delete runs three 0.1s sleeps in parallel → ~0.3s total
+    # each delete's unlink waits for the other one to start
     await asyncio.gather(
         svc.delete_document("docA"),
         svc.delete_document("docB"),
     )
-    elapsed = time.monotonic() - start
-    assert 0.29 < elapsed < 0.35, f"Delete not parallel: {elapsed:.3f}s"
+    assert remove_gate.is_set(), "Delete not parallel"
 
 
 @pytest.mark.asyncio
-async def test_mixed_get_delete_parallelism(svc):
-    # Prepare one PDF for get, none for delete
-    pdfp = svc.base_path / "pdfs" / "M1.pdf"
-    pdfp.parent.mkdir(parents=True, exist_ok=True)
-    pdfp.write_bytes(b"x")
+async def test_mixed_get_delete_parallelism(svc, remove_gate):
+    # Prepare one PDF for get and one for delete
+    for doc in ("M1", "M2"):
+        pdfp = svc.base_path / "pdfs" / f"{doc}.pdf"
+        pdfp.parent.mkdir(parents=True, exist_ok=True)
+        pdfp.write_bytes(b"x")
+
+    async def get_then_arrive():
+        path = await svc.get_pdf_path("M1")
+        await asyncio.to_thread(remove_gate.arrive, "get")
+        return path
 
-    start = time.monotonic()
+    # the delete's unlink is held until the get has completed alongside it
     results = await asyncio.gather(
-        svc.get_pdf_path("M1"),
+        get_then_arrive(),
         svc.delete_document("M2"),
     )
-    elapsed = time.monotonic() - start
 
     assert isinstance(results[0], Path)
     assert results[1] is None
-    # get costs 0.1s, delete costs 0.3s → ~0.3s total
-    assert 0.29 < elapsed < 0.35, f"Mixed get/delete not parallel: {elapsed:.3f}s"
+    assert remove_gate.is_set(), "Mixed get/delete not parallel"